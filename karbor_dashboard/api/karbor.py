@@ -13,32 +13,90 @@
 #    under the License.
 
 from __future__ import absolute_import
+import collections
+import functools
+import hashlib
+import json
 import logging
+import uuid
 
 from django.conf import settings
+from django.utils import dateparse
+from django.utils import six
+from django.utils import timezone
 from horizon import exceptions
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized
+from karbor_dashboard.api import utils as api_utils
 from karborclient.v1 import client as karbor_client
 from openstack_dashboard.api import base
 
 LOG = logging.getLogger(__name__)
 
+# Clients are reused across the requests of a user to keep connections alive.
+CLIENT_POOL = api_utils.ClientPool(max_size=64)
 
-def get_karbor_endpoint(request):
-    endpoint = ""
+# Providers and their schemas rarely change, share them across requests.
+PROVIDER_CACHE = api_utils.LRUCache('provider', ttl=300, max_entries=128)
+
+# Karbor endpoints resolved from the service catalog, keyed by region and
+# a fingerprint of the data-protect catalog entries, so that new tokens of
+# an unchanged catalog keep hitting the same entry.
+ENDPOINT_CACHE = api_utils.LRUCache('endpoint', ttl=3600, max_entries=256)
+DEFAULT_ENDPOINT = 'http://localhost:8799'
+
+ResolvedEndpoint = collections.namedtuple('ResolvedEndpoint',
+                                          ('endpoint', 'fallback'))
+
+CheckpointSummary = collections.namedtuple('CheckpointSummary',
+                                           ('plan_name', 'status'))
+
+
+@memoized
+def _catalog_fingerprint(request):
+    """Return a digest of the data-protect entries of the service catalog."""
+    catalog = getattr(request.user, 'service_catalog', None) or []
+    entries = [service.get('endpoints') for service in catalog
+               if service.get('type') == 'data-protect']
+    serialized = json.dumps(entries, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(serialized).hexdigest()
+
+
+def resolve_karbor_endpoint(request):
+    """Return the ResolvedEndpoint of the region of the request."""
+    region = getattr(request.user, 'services_region', None) or ''
+    fingerprint = _catalog_fingerprint(request)
+    cached = ENDPOINT_CACHE.get(region, fingerprint)
+    if cached is not None:
+        return ResolvedEndpoint(*cached)
     try:
-        endpoint = base.url_for(request, "data-protect")
+        resolved = ResolvedEndpoint(base.url_for(request, "data-protect"),
+                                    False)
     except exceptions.ServiceCatalogException:
-        endpoint = 'http://localhost:8799'
+        resolved = ResolvedEndpoint(DEFAULT_ENDPOINT, True)
         LOG.warning('Karbor API location could not be found in Service '
-                    'Catalog, using default: {0}'.format(endpoint))
-    return endpoint
+                    'Catalog, using default: {0}'.format(DEFAULT_ENDPOINT))
+    # Stored as a list: the cache loads tuples back as API resources.
+    ENDPOINT_CACHE.set(region, fingerprint, list(resolved))
+    return resolved
+
+
+def get_karbor_endpoint(request):
+    return resolve_karbor_endpoint(request).endpoint
 
 
 @memoized
 def karborclient(request):
     endpoint = get_karbor_endpoint(request)
+    token = request.user.token
+    key = (token.id, endpoint, request.user.tenant_id)
+    return CLIENT_POOL.get(
+        key,
+        lambda: _create_karborclient(request, endpoint),
+        expires=getattr(token, 'expires', None))
+
+
+def _create_karborclient(request, endpoint):
     LOG.debug('karborclient connection created using the token "%s" and url'
               '"%s"' % (request.user.token.id, endpoint))
     c = karbor_client.Client(endpoint=endpoint,
@@ -52,6 +110,95 @@ def karborclient(request):
     return c
 
 
+@memoized
+def _request_cache(request, name):
+    """Return a dict that lives as long as the given request."""
+    return {}
+
+
+def _cache_key(request, *parts):
+    """Build a cache key scoped to the project of the request."""
+    return ':'.join(('karbor', request.user.tenant_id) + parts)
+
+
+def _page_cache_key(request, resource, marker, params):
+    generation = api_utils.get_cache().get(
+        _cache_key(request, 'pages', resource)) or '0'
+    digest = hashlib.sha1(json.dumps([marker, params], sort_keys=True,
+                                     default=str).encode('utf-8'))
+    return _cache_key(request, 'pages', resource, generation,
+                      digest.hexdigest())
+
+
+def _page_cache_ttl():
+    return getattr(settings, 'KARBOR_PAGE_CACHE_TTL', 0)
+
+
+def page_cache_invalidate(request, resource):
+    """Drop the cached pages of a resource list of the current project."""
+    if _page_cache_ttl():
+        api_utils.get_cache().set(_cache_key(request, 'pages', resource),
+                                  uuid.uuid4().hex, None)
+
+
+def _fetch_page(request, resource, fetch, marker, params):
+    """Return the entities after marker, from the page cache if possible."""
+    ttl = _page_cache_ttl()
+    if not ttl:
+        return fetch(marker=marker)
+
+    cache = api_utils.get_cache()
+    key = _page_cache_key(request, resource, marker, params)
+    entities = cache.get(key)
+    if entities is not None:
+        return api_utils.load_resource(entities)
+    entities = fetch(marker=marker)
+    cache.set(key, api_utils.dump_resource(entities), ttl)
+    return entities
+
+
+def _list_paged(request, resource, list_func, marker=None, limit=None,
+                sort_key=None, sort_dir=None, paginate=False,
+                reversed_order=False, **kwargs):
+    """List a resource, optionally one page at a time.
+
+    ``list_func`` is the list call of the resource manager, it is passed
+    ``marker``, ``limit``, ``sort_key``, ``sort_dir`` and ``kwargs``.
+    When paginating, one more entity than the page size is requested to
+    know whether there is a next page, and the result is returned along
+    with whether there are more and previous pages. Pages are expected
+    to be sorted by the server.
+
+    With KARBOR_PAGE_CACHE_TTL set, pages are kept in the cache of the
+    project, keyed by their marker, until they expire or the resource is
+    changed through the dashboard. With KARBOR_PAGE_PREFETCH also set,
+    the page following the requested one is fetched in the background,
+    unless KARBOR_TABLE_PREFETCH is set: the tables then prefetch their
+    next page themselves, enriched rows included.
+    """
+    if not paginate:
+        entities = list_func(marker=marker, limit=limit, sort_key=sort_key,
+                             sort_dir=sort_dir, **kwargs)
+        return (entities, False, False)
+
+    if reversed_order:
+        sort_dir = 'desc' if sort_dir == 'asc' else 'asc'
+    page_size = utils.get_page_size(request)
+    fetch = functools.partial(list_func, limit=page_size + 1,
+                              sort_key=sort_key, sort_dir=sort_dir, **kwargs)
+    params = dict(kwargs, limit=page_size + 1, sort_key=sort_key,
+                  sort_dir=sort_dir)
+
+    entities = list(_fetch_page(request, resource, fetch, marker, params))
+    if (len(entities) > page_size and _page_cache_ttl() and
+            getattr(settings, 'KARBOR_PAGE_PREFETCH', False) and
+            not getattr(settings, 'KARBOR_TABLE_PREFETCH', False)):
+        api_utils.submit_background(_fetch_page, request, resource, fetch,
+                                    entities[page_size - 1].id, params)
+    return update_pagination(entities, page_size, marker, sort_dir, sort_key,
+                             reversed_order)
+
+
 def update_pagination(entities, page_size, marker, sort_dir, sort_key,
                       reversed_order):
     has_more_data = has_prev_data = False
@@ -69,23 +216,26 @@ def update_pagination(entities, page_size, marker, sort_dir, sort_key,
 
     # restore the original ordering here
     if reversed_order:
-        entities = sorted(entities, key=lambda entity:
-                          (getattr(entity, sort_key) or '').lower(),
-                          reverse=(sort_dir == 'asc'))
+        # The server sorted the page the other way round.
+        entities = entities[::-1]
 
     return entities, has_more_data, has_prev_data
 
 
 def plan_create(request, name, provider_id, resources, parameters):
+    provider_cache_invalidate(request, provider_id)
+    page_cache_invalidate(request, 'plans')
     return karborclient(request).plans.create(name, provider_id, resources,
                                               parameters)
 
 
 def plan_delete(request, plan_id):
+    page_cache_invalidate(request, 'plans')
     return karborclient(request).plans.delete(plan_id)
 
 
 def plan_update(request, plan_id, data):
+    page_cache_invalidate(request, 'plans')
     return karborclient(request).plans.update(plan_id, data)
 
 
@@ -103,31 +253,11 @@ def plan_list(request, detailed=False, search_opts=None, marker=None,
 def plan_list_paged(request, detailed=False, search_opts=None, marker=None,
                     limit=None, sort_key=None, sort_dir=None, sort=None,
                     paginate=False, reversed_order=False):
-    has_more_data = False
-    has_prev_data = False
-
-    if paginate:
-        if reversed_order:
-            sort_dir = 'desc' if sort_dir == 'asc' else 'asc'
-        page_size = utils.get_page_size(request)
-        plans = karborclient(request).plans.list(detailed=detailed,
-                                                 search_opts=search_opts,
-                                                 marker=marker,
-                                                 limit=page_size + 1,
-                                                 sort_key=sort_key,
-                                                 sort_dir=sort_dir,
-                                                 sort=sort)
-        plans, has_more_data, has_prev_data = update_pagination(
-            plans, page_size, marker, sort_dir, sort_key, reversed_order)
-    else:
-        plans = karborclient(request).plans.list(detailed=detailed,
-                                                 search_opts=search_opts,
-                                                 marker=marker,
-                                                 limit=limit,
-                                                 sort_key=sort_key,
-                                                 sort_dir=sort_dir,
-                                                 sort=sort)
-    return (plans, has_more_data, has_prev_data)
+    return _list_paged(request, 'plans', karborclient(request).plans.list,
+                       marker=marker, limit=limit, sort_key=sort_key,
+                       sort_dir=sort_dir, paginate=paginate,
+                       reversed_order=reversed_order, detailed=detailed,
+                       search_opts=search_opts, sort=sort)
 
 
 def plan_get(request, plan_id):
@@ -136,6 +266,7 @@ def plan_get(request, plan_id):
 
 def scheduled_operation_create(request, name, operation_type, trigger_id,
                                operation_definition):
+    page_cache_invalidate(request, 'scheduled_operations')
     return karborclient(request).scheduled_operations.create(
         name,
         operation_type,
@@ -144,6 +275,7 @@ def scheduled_operation_create(request, name, operation_type, trigger_id,
 
 
 def scheduled_operation_delete(request, scheduled_operation_id):
+    page_cache_invalidate(request, 'scheduled_operations')
     return karborclient(request).scheduled_operations.delete(
         scheduled_operation_id)
 
@@ -165,39 +297,12 @@ def scheduled_operation_list_paged(request, detailed=False, search_opts=None,
                                    marker=None, limit=None, sort_key=None,
                                    sort_dir=None, sort=None, paginate=False,
                                    reversed_order=False):
-    has_more_data = False
-    has_prev_data = False
-
-    if paginate:
-        if reversed_order:
-            sort_dir = 'desc' if sort_dir == 'asc' else 'asc'
-        page_size = utils.get_page_size(request)
-        scheduled_operations = karborclient(request).scheduled_operations.list(
-            detailed=detailed,
-            search_opts=search_opts,
-            marker=marker,
-            limit=page_size + 1,
-            sort_key=sort_key,
-            sort_dir=sort_dir,
-            sort=sort)
-        scheduled_operations, has_more_data, has_prev_data = update_pagination(
-            scheduled_operations,
-            page_size,
-            marker,
-            sort_dir,
-            sort_key,
-            reversed_order)
-    else:
-        scheduled_operations = karborclient(request).scheduled_operations.list(
-            detailed=detailed,
-            search_opts=search_opts,
-            marker=marker,
-            limit=limit,
-            sort_key=sort_key,
-            sort_dir=sort_dir,
-            sort=sort)
-
-    return (scheduled_operations, has_more_data, has_prev_data)
+    return _list_paged(request, 'scheduled_operations',
+                       karborclient(request).scheduled_operations.list,
+                       marker=marker, limit=limit, sort_key=sort_key,
+                       sort_dir=sort_dir, paginate=paginate,
+                       reversed_order=reversed_order, detailed=detailed,
+                       search_opts=search_opts, sort=sort)
 
 
 def scheduled_operation_get(request, scheduled_operation_id):
@@ -207,6 +312,8 @@ def scheduled_operation_get(request, scheduled_operation_id):
 
 def restore_create(request, provider_id, checkpoint_id,
                    restore_target, parameters, restore_auth):
+    provider_cache_invalidate(request, provider_id)
+    page_cache_invalidate(request, 'restores')
     return karborclient(request).restores.create(provider_id,
                                                  checkpoint_id,
                                                  restore_target,
@@ -215,6 +322,7 @@ def restore_create(request, provider_id, checkpoint_id,
 
 
 def restore_delete(request, restore_id):
+    page_cache_invalidate(request, 'restores')
     return karborclient(request).restores.delete(restore_id)
 
 
@@ -232,38 +340,77 @@ def restore_list(request, detailed=False, search_opts=None, marker=None,
 def restore_list_paged(request, detailed=False, search_opts=None, marker=None,
                        limit=None, sort_key=None, sort_dir=None, sort=None,
                        paginate=False, reversed_order=False):
-    has_more_data = False
-    has_prev_data = False
-
-    if paginate:
-        if reversed_order:
-            sort_dir = 'desc' if sort_dir == 'asc' else 'asc'
-        page_size = utils.get_page_size(request)
-        restores = karborclient(request).restores.list(detailed=detailed,
-                                                       search_opts=search_opts,
-                                                       marker=marker,
-                                                       limit=page_size + 1,
-                                                       sort_key=sort_key,
-                                                       sort_dir=sort_dir,
-                                                       sort=sort)
-        restores, has_more_data, has_prev_data = update_pagination(
-            restores, page_size, marker, sort_dir, sort_key, reversed_order)
-    else:
-        restores = karborclient(request).restores.list(detailed=detailed,
-                                                       search_opts=search_opts,
-                                                       marker=marker,
-                                                       limit=limit,
-                                                       sort_key=sort_key,
-                                                       sort_dir=sort_dir,
-                                                       sort=sort)
-
-    return (restores, has_more_data, has_prev_data)
+    return _list_paged(request, 'restores',
+                       karborclient(request).restores.list,
+                       marker=marker, limit=limit, sort_key=sort_key,
+                       sort_dir=sort_dir, paginate=paginate,
+                       reversed_order=reversed_order, detailed=detailed,
+                       search_opts=search_opts, sort=sort)
 
 
 def restore_get(request, restore_id):
     return karborclient(request).restores.get(restore_id)
 
 
+def restore_get_statuses(request, restore_ids):
+    """Return a dict mapping restore ids to their status.
+
+    The restores are fetched concurrently. Those that no longer exist map
+    to None, those that could not be retrieved are left out.
+    """
+    return _get_statuses(restore_get,
+                         [(request, restore_id) for restore_id in restore_ids],
+                         restore_ids)
+
+
+def operation_log_list(request, detailed=False, search_opts=None,
+                       marker=None, limit=None, sort_key=None, sort_dir=None,
+                       sort=None):
+    return karborclient(request).operation_logs.list(detailed=detailed,
+                                                     search_opts=search_opts,
+                                                     marker=marker,
+                                                     limit=limit,
+                                                     sort_key=sort_key,
+                                                     sort_dir=sort_dir,
+                                                     sort=sort)
+
+
+def operation_log_list_paged(request, detailed=False, search_opts=None,
+                             marker=None, limit=None,
+                             sort_key='actual_start_time', sort_dir='desc',
+                             sort=None, paginate=False, reversed_order=False,
+                             since=None):
+    """List the operation logs, newest first, optionally one page at a time.
+
+    With ``since``, a naive UTC datetime, the logs that actually started
+    before it are left out, and paging stops at the first of them, so
+    that older logs are never fetched.
+    """
+    logs, has_more_data, has_prev_data = _list_paged(
+        request, 'operation_logs',
+        functools.partial(operation_log_list, request),
+        marker=marker, limit=limit, sort_key=sort_key, sort_dir=sort_dir,
+        paginate=paginate, reversed_order=reversed_order, detailed=detailed,
+        search_opts=search_opts, sort=sort)
+    if since is not None:
+        recent = [log for log in logs if not _started_before(log, since)]
+        if len(recent) < len(logs) and not reversed_order:
+            has_more_data = False
+        logs = recent
+    return logs, has_more_data, has_prev_data
+
+
+def _started_before(log, since):
+    started = getattr(log, 'actual_start_time', None)
+    if isinstance(started, six.string_types):
+        started = dateparse.parse_datetime(started)
+    if started is None:
+        return False
+    if timezone.is_aware(started):
+        started = timezone.make_naive(started, timezone.utc)
+    return started < since
+
+
 def protectable_list(request):
     return karborclient(request).protectables.list()
 
@@ -289,93 +436,148 @@ def protectable_list_instances_paged(request, protectable_type,
                                      search_opts=None, marker=None, limit=None,
                                      sort_key=None, sort_dir=None, sort=None,
                                      paginate=False, reversed_order=False):
-    has_more_data = False
-    has_prev_data = False
-
-    if paginate:
-        if reversed_order:
-            sort_dir = 'desc' if sort_dir == 'asc' else 'asc'
-        page_size = utils.get_page_size(request)
-        instances = karborclient(request).protectables.list_instances(
-            protectable_type,
-            search_opts=search_opts,
-            marker=marker,
-            limit=page_size + 1,
-            sort_key=sort_key,
-            sort_dir=sort_dir,
-            sort=sort)
-        instances, has_more_data, has_prev_data = update_pagination(
-            instances, page_size, marker, sort_dir, sort_key, reversed_order)
-    else:
-        instances = karborclient(request).protectables.list_instances(
-            protectable_type,
-            search_opts=search_opts,
-            marker=marker,
-            limit=limit,
-            sort_key=sort_key,
-            sort_dir=sort_dir,
-            sort=sort)
-
-    return (instances, has_more_data, has_prev_data)
+    list_instances = functools.partial(
+        karborclient(request).protectables.list_instances, protectable_type)
+    return _list_paged(request, 'protectables:%s' % protectable_type,
+                       list_instances,
+                       marker=marker, limit=limit, sort_key=sort_key,
+                       sort_dir=sort_dir, paginate=paginate,
+                       reversed_order=reversed_order,
+                       search_opts=search_opts, sort=sort)
 
 
 def protectable_get_instance(request, type, id):
     return karborclient(request).protectables.get_instance(type, id)
 
 
+def _get_statuses(get_func, args_list, ids):
+    results = api_utils.concurrent_map(get_func, args_list,
+                                       raise_errors=False)
+    statuses = {}
+    for obj_id, result in zip(ids, results):
+        if not isinstance(result, Exception):
+            statuses[obj_id] = result.status
+        elif getattr(result, 'code', None) == 404:
+            statuses[obj_id] = None
+        elif isinstance(result, exceptions.UNAUTHORIZED):
+            # Not specific to the object, none of the others is readable.
+            raise result
+        else:
+            LOG.warning('Unable to retrieve the status of %s: %s',
+                        obj_id, result)
+    return statuses
+
+
+def protectable_get_instances_bulk(request, keys, raise_errors=True):
+    """Return a dict mapping (type, id) pairs to protectable instances.
+
+    Every distinct instance is fetched at most once per request; those
+    not fetched yet are retrieved concurrently. When ``raise_errors`` is
+    False a failed lookup maps its pair to the exception instead.
+    """
+    cache = _request_cache(request, 'protectable_instances')
+    missing = [key for key in collections.OrderedDict.fromkeys(keys)
+               if key not in cache]
+    instances = api_utils.concurrent_map(
+        protectable_get_instance,
+        [(request, type, id) for type, id in missing],
+        raise_errors=raise_errors)
+
+    result = {}
+    for key, instance in zip(missing, instances):
+        if isinstance(instance, Exception):
+            LOG.warning('Unable to retrieve protectable %s %s: %s',
+                        key[0], key[1], instance)
+            result[key] = instance
+        else:
+            cache[key] = instance
+    for key in keys:
+        result.setdefault(key, cache.get(key))
+    return result
+
+
 def provider_list(request, detailed=False, search_opts=None, marker=None,
                   limit=None, sort_key=None, sort_dir=None, sort=None):
-    return karborclient(request).providers.list(detailed=detailed,
-                                                search_opts=search_opts,
-                                                marker=marker,
-                                                limit=limit,
-                                                sort_key=sort_key,
-                                                sort_dir=sort_dir,
-                                                sort=sort)
+    # Only the complete, unfiltered list is shared across requests.
+    cacheable = not any((search_opts, marker, limit, sort_key, sort_dir,
+                         sort))
+    if cacheable:
+        providers = PROVIDER_CACHE.get(request.user.tenant_id,
+                                       '__list__%s' % detailed)
+        if providers is not None:
+            return providers
+
+    providers = karborclient(request).providers.list(detailed=detailed,
+                                                     search_opts=search_opts,
+                                                     marker=marker,
+                                                     limit=limit,
+                                                     sort_key=sort_key,
+                                                     sort_dir=sort_dir,
+                                                     sort=sort)
+    if cacheable:
+        PROVIDER_CACHE.set(request.user.tenant_id, '__list__%s' % detailed,
+                           providers)
+    return providers
 
 
 def provider_list_paged(request, detailed=False, search_opts=None, marker=None,
                         limit=None, sort_key=None, sort_dir=None, sort=None,
                         paginate=False, reversed_order=False):
-    has_more_data = False
-    has_prev_data = False
-
-    if paginate:
-        if reversed_order:
-            sort_dir = 'desc' if sort_dir == 'asc' else 'asc'
-        page_size = utils.get_page_size(request)
-        providers = karborclient(request).providers.list(
-            detailed=detailed,
-            search_opts=search_opts,
-            marker=marker,
-            limit=page_size + 1,
-            sort_key=sort_key,
-            sort_dir=sort_dir,
-            sort=sort)
-        providers, has_more_data, has_prev_data = update_pagination(
-            providers, page_size, marker, sort_dir, sort_key, reversed_order)
+    return _list_paged(request, 'providers',
+                       karborclient(request).providers.list,
+                       marker=marker, limit=limit, sort_key=sort_key,
+                       sort_dir=sort_dir, paginate=paginate,
+                       reversed_order=reversed_order, detailed=detailed,
+                       search_opts=search_opts, sort=sort)
+
+
+def provider_get(request, provider_id):
+    provider = PROVIDER_CACHE.get(request.user.tenant_id, provider_id)
+    if provider is None:
+        provider = karborclient(request).providers.get(provider_id)
+        PROVIDER_CACHE.set(request.user.tenant_id, provider_id, provider)
+    return provider
+
+
+def provider_cache_invalidate(request, provider_id=None):
+    """Drop a cached provider, or all providers of the current project."""
+    project_id = request.user.tenant_id
+    if provider_id is None:
+        PROVIDER_CACHE.delete(project_id)
     else:
-        providers = karborclient(request).providers.list(
-            detailed=detailed,
-            search_opts=search_opts,
-            marker=marker,
-            limit=limit,
-            sort_key=sort_key,
-            sort_dir=sort_dir,
-            sort=sort)
+        PROVIDER_CACHE.delete(project_id, provider_id)
+        PROVIDER_CACHE.delete(project_id, '__list__True')
+        PROVIDER_CACHE.delete(project_id, '__list__False')
 
-    return (providers, has_more_data, has_prev_data)
 
+def provider_get_bulk(request, provider_ids, providers=None):
+    """Return a dict mapping each of the given provider ids to its provider.
 
-def provider_get(request, provider_id):
-    return karborclient(request).providers.get(provider_id)
+    Every distinct provider id is fetched at most once per request. The
+    providers the caller has already listed can be passed in through
+    ``providers`` and are used instead of fetching them again.
+    """
+    cache = _request_cache(request, 'providers')
+    for provider in providers or []:
+        cache.setdefault(provider.id, provider)
+
+    result = {}
+    for provider_id in set(provider_ids):
+        if provider_id not in cache:
+            cache[provider_id] = provider_get(request, provider_id)
+        result[provider_id] = cache[provider_id]
+    return result
 
 
 def checkpoint_create(request, provider_id, plan_id):
+    provider_cache_invalidate(request, provider_id)
+    page_cache_invalidate(request, 'checkpoints')
     return karborclient(request).checkpoints.create(provider_id, plan_id)
 
 
 def checkpoint_delete(request, provider_id, checkpoint_id):
+    provider_cache_invalidate(request, provider_id)
+    page_cache_invalidate(request, 'checkpoints')
     return karborclient(request).checkpoints.delete(provider_id, checkpoint_id)
 
 
@@ -394,45 +596,65 @@ def checkpoint_list_paged(request, provider_id=None, search_opts=None,
                           marker=None, limit=None, sort_key=None,
                           sort_dir=None, sort=None, paginate=False,
                           reversed_order=False):
-    has_more_data = False
-    has_prev_data = False
-
-    if paginate:
-        if reversed_order:
-            sort_dir = 'desc' if sort_dir == 'asc' else 'asc'
-        page_size = utils.get_page_size(request)
-        checkpoints = karborclient(request).checkpoints.list(
-            provider_id=provider_id,
-            search_opts=search_opts,
-            marker=marker,
-            limit=page_size + 1,
-            sort_key=sort_key,
-            sort_dir=sort_dir,
-            sort=sort)
-        checkpoints, has_more_data, has_prev_data = update_pagination(
-            checkpoints, page_size, marker, sort_dir, sort_key, reversed_order)
-    else:
-        checkpoints = karborclient(request).checkpoints.list(
-            provider_id=provider_id,
-            search_opts=search_opts,
-            marker=marker,
-            limit=limit,
-            sort_key=sort_key,
-            sort_dir=sort_dir,
-            sort=sort)
-
-    return (checkpoints, has_more_data, has_prev_data)
+    return _list_paged(request, 'checkpoints',
+                       karborclient(request).checkpoints.list,
+                       marker=marker, limit=limit, sort_key=sort_key,
+                       sort_dir=sort_dir, paginate=paginate,
+                       reversed_order=reversed_order, provider_id=provider_id,
+                       search_opts=search_opts, sort=sort)
 
 
 def checkpoint_get(request, provider_id, checkpoint_id):
     return karborclient(request).checkpoints.get(provider_id, checkpoint_id)
 
 
+def checkpoint_get_statuses(request, provider_id, checkpoint_ids):
+    """Return a dict mapping checkpoint ids to their status.
+
+    The checkpoints are fetched concurrently and only their summary is
+    kept, so that polling does not hold on to their resource graphs.
+    Those that no longer exist or are deleted map to None, those that
+    could not be retrieved are left out.
+    """
+    statuses = _get_statuses(checkpoint_get_summary,
+                             [(request, provider_id, checkpoint_id, True)
+                              for checkpoint_id in checkpoint_ids],
+                             checkpoint_ids)
+    return dict((checkpoint_id, None if status == 'deleted' else status)
+                for checkpoint_id, status in statuses.items())
+
+
+def checkpoint_get_summary(request, provider_id, checkpoint_id,
+                           refresh=False):
+    """Return the protection plan name and status of a checkpoint.
+
+    Only the summary is kept in the cache, so that labelling a row does
+    not require holding on to the checkpoint and its resource graph.
+    With ``refresh`` the checkpoint is fetched again, for a current
+    status.
+    """
+    key = _cache_key(request, 'checkpoint_summary', provider_id,
+                     checkpoint_id)
+    cache = api_utils.get_cache()
+    summary = None if refresh else cache.get(key)
+    if summary is None:
+        checkpoint = checkpoint_get(request, provider_id, checkpoint_id)
+        plan = getattr(checkpoint, 'protection_plan', None) or {}
+        summary = CheckpointSummary(plan_name=plan.get("name"),
+                                    status=checkpoint.status)
+        cache.set(key, summary,
+                  getattr(settings, 'KARBOR_CHECKPOINT_SUMMARY_CACHE_TTL',
+                          60))
+    return summary
+
+
 def trigger_create(request, name, type, properties):
+    page_cache_invalidate(request, 'triggers')
     return karborclient(request).triggers.create(name, type, properties)
 
 
 def trigger_delete(request, trigger_id):
+    page_cache_invalidate(request, 'triggers')
     return karborclient(request).triggers.delete(trigger_id)
 
 
@@ -450,32 +672,12 @@ def trigger_list(request, detailed=False, search_opts=None, marker=None,
 def trigger_list_paged(request, detailed=False, search_opts=None, marker=None,
                        limit=None, sort_key=None, sort_dir=None, sort=None,
                        paginate=False, reversed_order=False):
-    has_more_data = False
-    has_prev_data = False
-
-    if paginate:
-        if reversed_order:
-            sort_dir = 'desc' if sort_dir == 'asc' else 'asc'
-        page_size = utils.get_page_size(request)
-        triggers = karborclient(request).triggers.list(detailed=detailed,
-                                                       search_opts=search_opts,
-                                                       marker=marker,
-                                                       limit=page_size + 1,
-                                                       sort_key=sort_key,
-                                                       sort_dir=sort_dir,
-                                                       sort=sort)
-        triggers, has_more_data, has_prev_data = update_pagination(
-            triggers, page_size, marker, sort_dir, sort_key, reversed_order)
-    else:
-        triggers = karborclient(request).triggers.list(detailed=detailed,
-                                                       search_opts=search_opts,
-                                                       marker=marker,
-                                                       limit=limit,
-                                                       sort_key=sort_key,
-                                                       sort_dir=sort_dir,
-                                                       sort=sort)
-
-    return (triggers, has_more_data, has_prev_data)
+    return _list_paged(request, 'triggers',
+                       karborclient(request).triggers.list,
+                       marker=marker, limit=limit, sort_key=sort_key,
+                       sort_dir=sort_dir, paginate=paginate,
+                       reversed_order=reversed_order, detailed=detailed,
+                       search_opts=search_opts, sort=sort)
 
 
 def trigger_get(request, trigger_id):
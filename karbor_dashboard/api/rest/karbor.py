@@ -0,0 +1,47 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""API over the Karbor service.
+"""
+
+from django.conf import settings
+from django.views import generic
+
+from karbor_dashboard.api import karbor
+from openstack_dashboard.api.rest import urls
+from openstack_dashboard.api.rest import utils as rest_utils
+
+
+@urls.register
+class Endpoints(generic.View):
+    """API for the Karbor endpoint resolved from the service catalog.
+
+    Only available when DEBUG is enabled.
+    """
+    url_regex = r'karbor/endpoints/$'
+
+    @rest_utils.ajax()
+    def get(self, request):
+        """Get the Karbor endpoint the region of the user resolved to.
+
+        The result is an object with the region, the endpoint and whether
+        the default endpoint was used because the catalog had none.
+        """
+        if not settings.DEBUG:
+            raise rest_utils.AjaxError(404, 'Not found')
+
+        resolved = karbor.resolve_karbor_endpoint(request)
+        return {'region': getattr(request.user, 'services_region', None),
+                'endpoint': resolved.endpoint,
+                'fallback': resolved.fallback}
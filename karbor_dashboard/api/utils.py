@@ -0,0 +1,325 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+from concurrent import futures
+import datetime
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 10
+
+
+def get_max_workers():
+    return getattr(settings, 'KARBOR_API_MAX_WORKERS', DEFAULT_MAX_WORKERS)
+
+
+def get_bulk_action_max_workers():
+    """Return how many objects a bulk table action processes at a time."""
+    return getattr(settings, 'KARBOR_BULK_ACTION_MAX_WORKERS',
+                   get_max_workers())
+
+
+def get_cache():
+    """Return the Django cache used by the Karbor dashboard."""
+    return caches[getattr(settings, 'KARBOR_CACHE_ALIAS', 'default')]
+
+
+def dump_resource(resource):
+    """Convert an API resource into a value that can be cached.
+
+    karborclient resources keep a reference to their manager and cannot
+    be pickled, so only their class and raw info are stored.
+    """
+    if isinstance(resource, list):
+        return [dump_resource(item) for item in resource]
+    info = getattr(resource, '_info', None)
+    if info is None:
+        return resource
+    return (resource.__class__, info)
+
+
+def load_resource(value):
+    """Rebuild an API resource stored with dump_resource()."""
+    if isinstance(value, list):
+        return [load_resource(item) for item in value]
+    if isinstance(value, tuple):
+        resource_class, info = value
+        return resource_class(None, info, loaded=True)
+    return value
+
+
+class LRUCache(object):
+    """A size bound, TTL based cache of API resources.
+
+    Entries are kept in the Django cache, grouped in namespaces (usually
+    a project id). Every namespace keeps an index of its keys in least
+    recently used order, and the least recently used entries are evicted
+    once the namespace grows beyond ``KARBOR_<NAME>_CACHE_MAX_ENTRIES``.
+    A hit only rewrites the index when the entry is in its older half,
+    so the entries read most often do not cause a write on every hit.
+    Updates of the index are not atomic across processes, so with a
+    shared backend the size bound is approximate.
+    """
+
+    def __init__(self, name, ttl=300, max_entries=128):
+        self.name = name
+        self.default_ttl = ttl
+        self.default_max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'KARBOR_%s_CACHE_TTL' % self.name.upper(),
+                       self.default_ttl)
+
+    @property
+    def max_entries(self):
+        return getattr(settings,
+                       'KARBOR_%s_CACHE_MAX_ENTRIES' % self.name.upper(),
+                       self.default_max_entries)
+
+    def _key(self, namespace, key):
+        return ':'.join(('karbor', self.name, namespace, key))
+
+    def _index_key(self, namespace):
+        return self._key(namespace, '__index__')
+
+    def _touch(self, namespace, key):
+        cache = get_cache()
+        with self._lock:
+            index = cache.get(self._index_key(namespace)) or []
+            if key in index:
+                index.remove(key)
+            index.append(key)
+            evicted = index[:-self.max_entries]
+            del index[:-self.max_entries]
+            cache.set(self._index_key(namespace), index, self.ttl)
+        if evicted:
+            cache.delete_many([self._key(namespace, k) for k in evicted])
+
+    def _refresh(self, namespace, key):
+        cache = get_cache()
+        with self._lock:
+            index = cache.get(self._index_key(namespace)) or []
+            if key in index[len(index) // 2:]:
+                return
+            if key in index:
+                index.remove(key)
+            index.append(key)
+            cache.set(self._index_key(namespace), index, self.ttl)
+
+    def get(self, namespace, key):
+        value = get_cache().get(self._key(namespace, key))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if value is None:
+            return None
+        self._refresh(namespace, key)
+        return load_resource(value)
+
+    def set(self, namespace, key, value):
+        get_cache().set(self._key(namespace, key), dump_resource(value),
+                        self.ttl)
+        self._touch(namespace, key)
+
+    def delete(self, namespace, key=None):
+        """Drop one entry, or the whole namespace if no key is given."""
+        cache = get_cache()
+        with self._lock:
+            index = cache.get(self._index_key(namespace)) or []
+            if key is None:
+                keys, index = index, []
+            else:
+                keys = [key]
+                if key in index:
+                    index.remove(key)
+            cache.set(self._index_key(namespace), index, self.ttl)
+        cache.delete_many([self._key(namespace, k) for k in keys])
+
+
+class ClientPool(object):
+    """A bounded, thread-safe pool of API clients shared across requests.
+
+    Clients are kept per process, keyed by whatever identifies their
+    credentials (token id, endpoint and project), so that the HTTP
+    sessions they hold are reused by later requests of the same user.
+    The least recently used client is dropped once the pool grows beyond
+    ``KARBOR_CLIENT_POOL_SIZE``, and a client is never handed out after
+    its token expired.
+    """
+
+    # Drop clients slightly before their token expires.
+    EXPIRY_MARGIN = datetime.timedelta(seconds=30)
+
+    def __init__(self, max_size=64):
+        self.default_max_size = max_size
+        self._clients = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'KARBOR_CLIENT_POOL_SIZE',
+                       self.default_max_size)
+
+    def _expired(self, expires, now):
+        return expires is not None and expires - self.EXPIRY_MARGIN <= now
+
+    @staticmethod
+    def _utc(expires):
+        if expires is not None and timezone.is_aware(expires):
+            return timezone.make_naive(expires, timezone.utc)
+        return expires
+
+    def get(self, key, factory, expires=None):
+        """Return the client of key, creating it with factory() if needed.
+
+        ``expires`` is the expiry time of the token the client uses, naive
+        datetimes are taken to be in UTC.
+        """
+        now = datetime.datetime.utcnow()
+        expires = self._utc(expires)
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            if entry is not None and not self._expired(entry[1], now):
+                self._clients[key] = entry
+                return entry[0]
+
+        client = factory()
+        with self._lock:
+            for k, (_client, k_expires) in list(self._clients.items()):
+                if self._expired(k_expires, now):
+                    del self._clients[k]
+            self._clients[key] = (client, expires)
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+        return client
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def __len__(self):
+        return len(self._clients)
+
+
+def concurrent_map(func, args_list, max_workers=None, raise_errors=True,
+                   timeout=None):
+    """Call func(*args) for every args tuple on a bounded thread pool.
+
+    The results are returned in the order of ``args_list``. The first
+    exception raised by any of the calls is re-raised to the caller,
+    unless ``raise_errors`` is False, in which case the exception takes
+    the place of the result of the failed call.
+
+    With a ``timeout``, every call gets ``timeout`` seconds from the time
+    it starts, so calls queued behind others are not penalized for
+    waiting. A call still running after its timeout, or a queued one
+    that can no longer start because every worker is busy with a call
+    past its timeout, fails with ``concurrent.futures.TimeoutError``.
+    Calls past their timeout are not waited for, they finish in the
+    background.
+    """
+    def call(args):
+        try:
+            return func(*args)
+        except Exception as e:
+            if raise_errors:
+                raise
+            return e
+
+    args_list = list(args_list)
+    workers = min(max_workers or get_max_workers(), len(args_list))
+    if workers <= 1 and timeout is None:
+        return [call(args) for args in args_list]
+
+    started = [None] * len(args_list)
+    events = [threading.Event() for args in args_list]
+
+    def timed_call(index, args):
+        started[index] = time.time()
+        events[index].set()
+        return call(args)
+
+    def wait_result(index, job):
+        while not events[index].is_set():
+            # The call is queued: wait for a worker to free up, unless
+            # every worker is stuck in a call past its timeout.
+            now = time.time()
+            deadlines = [started[i] + timeout for i in range(index)
+                         if started[i] is not None and not jobs[i].done()]
+            pending = [deadline for deadline in deadlines if deadline > now]
+            if len(deadlines) >= workers and not pending:
+                if job.cancel():
+                    raise futures.TimeoutError()
+            events[index].wait(min(pending) - now if pending else None)
+        return job.result(
+            timeout=max(started[index] + timeout - time.time(), 0))
+
+    executor = futures.ThreadPoolExecutor(max_workers=max(workers, 1))
+    try:
+        jobs = [executor.submit(timed_call, index, args)
+                for index, args in enumerate(args_list)]
+        results = []
+        for index, job in enumerate(jobs):
+            if timeout is None:
+                results.append(job.result())
+                continue
+            try:
+                results.append(wait_result(index, job))
+            except futures.TimeoutError as e:
+                if raise_errors:
+                    raise
+                results.append(e)
+        return results
+    finally:
+        # Do not block on the calls that ran past their timeout.
+        executor.shutdown(wait=timeout is None)
+
+
+_background_executor = None
+_background_lock = threading.Lock()
+
+
+def submit_background(func, *args):
+    """Run func(*args) on a process wide pool, without waiting for it.
+
+    Meant for work nobody waits on, such as warming a cache. Errors are
+    only logged.
+    """
+    global _background_executor
+    with _background_lock:
+        if _background_executor is None:
+            _background_executor = futures.ThreadPoolExecutor(
+                max_workers=get_max_workers())
+
+    def call():
+        try:
+            func(*args)
+        except Exception:
+            LOG.debug('Background call of %s failed.', func, exc_info=True)
+
+    return _background_executor.submit(call)
@@ -0,0 +1,217 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Shared watchers of the status of Karbor objects.
+
+Every browser tab streaming status changes subscribes to the watcher of
+its (project, kind, provider) key. A watcher polls Karbor from a single
+thread for the union of the ids its subscribers watch, and hands every
+status change to the subscribers watching that id, so that any number of
+tabs watching the same objects cause a single upstream poll loop. Polls
+are made with the credentials of one of the current subscribers.
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+from django.utils.six.moves import queue
+from horizon import exceptions
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 5
+
+
+class Subscription(object):
+    """The status changes of some objects, as seen by one subscriber.
+
+    ``fetch(ids)`` fetches statuses with the credentials of the
+    subscriber; it returns a dict mapping ids to their status, None for
+    objects that no longer exist. Ids it leaves out are tried again on the
+    next poll.
+    """
+
+    def __init__(self, watcher, ids, fetch):
+        self.watcher = watcher
+        self.ids = frozenset(ids)
+        self.fetch = fetch
+        # Set once the credentials of the subscriber are rejected.
+        self.unauthorized = False
+        self._queue = queue.Queue()
+
+    def put(self, statuses):
+        self._queue.put(statuses)
+
+    def get(self, timeout=None):
+        """Return a dict of the ids whose status changed to their status.
+
+        Objects that no longer exist have a None status. Returns None if
+        nothing changed within ``timeout`` seconds.
+        """
+        try:
+            statuses = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        # Merge whatever else piled up meanwhile.
+        while True:
+            try:
+                statuses.update(self._queue.get_nowait())
+            except queue.Empty:
+                return statuses
+
+    def close(self):
+        self.watcher.unsubscribe(self)
+
+
+class StatusWatcher(object):
+    """Poll the statuses of the objects of a key on behalf of subscribers.
+
+    Every poll uses the fetch function of the most recent subscriber whose
+    credentials were not rejected. The thread stops once the last
+    subscriber is gone.
+    """
+
+    def __init__(self, registry, key, interval):
+        self.registry = registry
+        self.key = key
+        self.interval = interval
+        self.statuses = {}
+        # In subscription order.
+        self.subscriptions = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run,
+                                        name='karbor-watcher-%s' % (key,))
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+
+    def subscribe(self, ids, fetch):
+        subscription = Subscription(self, ids, fetch)
+        with self._lock:
+            self.subscriptions.append(subscription)
+            known = dict((obj_id, self.statuses[obj_id])
+                         for obj_id in subscription.ids
+                         if obj_id in self.statuses)
+        if known:
+            subscription.put(known)
+        self._wakeup.set()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self.subscriptions:
+                self.subscriptions.remove(subscription)
+        self._wakeup.set()
+
+    def poll(self):
+        """Fetch the watched statuses once and notify the subscribers."""
+        with self._lock:
+            ids = set()
+            for subscription in self.subscriptions:
+                ids.update(subscription.ids)
+            candidates = [subscription
+                          for subscription in reversed(self.subscriptions)
+                          if not subscription.unauthorized]
+        if not ids:
+            return
+
+        statuses = None
+        for subscription in candidates:
+            try:
+                statuses = subscription.fetch(sorted(ids))
+                break
+            except exceptions.UNAUTHORIZED:
+                # Its token expired, try the credentials of another one.
+                subscription.unauthorized = True
+            except Exception:
+                LOG.warning('Unable to poll the statuses of %s.', self.key,
+                            exc_info=True)
+                return
+        if statuses is None:
+            LOG.warning('No subscriber of %s is authorized to poll its '
+                        'statuses.', self.key)
+            return
+
+        with self._lock:
+            changed = dict((obj_id, status)
+                           for obj_id, status in statuses.items()
+                           if obj_id in ids and
+                           self.statuses.get(obj_id, '') != status)
+            self.statuses.update(changed)
+            # Forget the objects nobody watches anymore.
+            for obj_id in set(self.statuses) - ids:
+                del self.statuses[obj_id]
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            updates = dict((obj_id, status)
+                           for obj_id, status in changed.items()
+                           if obj_id in subscription.ids)
+            if updates:
+                subscription.put(updates)
+
+    def _run(self):
+        while self.registry.keep(self):
+            self._wakeup.clear()
+            self.poll()
+            self._wakeup.wait(self.interval)
+
+
+class WatcherRegistry(object):
+    """The running watchers, one per key."""
+
+    def __init__(self, interval=None):
+        self._interval = interval
+        self.watchers = {}
+        self._lock = threading.Lock()
+
+    @property
+    def interval(self):
+        """Seconds between two polls, KARBOR_STATUS_STREAM_INTERVAL."""
+        if self._interval is not None:
+            return self._interval
+        return getattr(settings, 'KARBOR_STATUS_STREAM_INTERVAL',
+                       DEFAULT_INTERVAL)
+
+    def subscribe(self, key, fetch, ids):
+        """Watch ``ids`` through the watcher of key, starting it if needed.
+
+        ``fetch`` polls with the credentials of the subscriber, see
+        Subscription.
+        """
+        with self._lock:
+            watcher = self.watchers.get(key)
+            started = watcher is None
+            if started:
+                watcher = StatusWatcher(self, key, self.interval)
+                self.watchers[key] = watcher
+            subscription = watcher.subscribe(ids, fetch)
+        if started:
+            watcher.start()
+        return subscription
+
+    def keep(self, watcher):
+        """Return whether watcher should keep running, dropping it if not."""
+        with self._lock:
+            with watcher._lock:
+                if watcher.subscriptions:
+                    return True
+            if self.watchers.get(watcher.key) is watcher:
+                del self.watchers[watcher.key]
+            return False
+
+    def __len__(self):
+        return len(self.watchers)
@@ -37,20 +37,10 @@ class RestoreCheckpointForm(horizon_forms.SelfHandlingForm):
     restore_target_password = forms.CharField(
         label=_("Restore Target Password"),
         widget=forms.PasswordInput())
-    provider = forms.CharField(
-        widget=forms.HiddenInput(attrs={"class": "provider"}))
     parameters = forms.CharField(
         widget=forms.HiddenInput(attrs={"class": "parameters"}))
     failure_url = 'horizon:karbor:checkpoints:index'
 
-    def __init__(self, request, *args, **kwargs):
-        super(RestoreCheckpointForm, self).\
-            __init__(request, *args, **kwargs)
-
-        provider_id = str(kwargs["initial"]["provider_id"])
-        provider = karborclient.provider_get(request, provider_id)
-        self.fields['provider'].initial = json.dumps(provider._info)
-
     @sensitive_variables('restore_target_password')
     def handle(self, request, data):
         try:
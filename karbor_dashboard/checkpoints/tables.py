@@ -19,6 +19,16 @@ from django.utils.translation import ungettext_lazy
 from horizon import tables
 
 from karbor_dashboard.api import karbor as karborclient
+from karbor_dashboard import tables as karbor_tables
+
+
+STATUS_CHOICES = (
+    ("protecting", None),
+    ("deleting", None),
+    ("available", True),
+    ("error", False),
+    ("error-deleting", False),
+)
 
 
 class RestoreCheckpointLink(tables.LinkAction):
@@ -36,7 +46,8 @@ class RestoreCheckpointLink(tables.LinkAction):
         return checkpoint.status == 'available'
 
 
-class DeleteCheckpointsAction(tables.DeleteAction):
+class DeleteCheckpointsAction(karbor_tables.ConcurrentDeleteMixin,
+                              tables.DeleteAction):
     @staticmethod
     def action_present(count):
         return ungettext_lazy(u"Delete Checkpoint",
@@ -53,10 +64,12 @@ class DeleteCheckpointsAction(tables.DeleteAction):
         return checkpoint.status == 'available'
 
     def delete(self, request, obj_id):
-        datum = self.table.get_object_by_id(obj_id)
-        provider_id = datum.provider_id
+        self.delete_object(request, obj_id,
+                           self.table.get_object_by_id(obj_id))
+
+    def delete_object(self, request, obj_id, datum):
         karborclient.checkpoint_delete(request,
-                                       provider_id=provider_id,
+                                       provider_id=datum.provider_id,
                                        checkpoint_id=obj_id)
 
 
@@ -87,11 +100,15 @@ class CheckpointsTable(tables.DataTable):
         verbose_name=_('Protection Plan'))
     status = tables.Column(
         'status',
-        verbose_name=_('Status'))
+        verbose_name=_('Status'),
+        status=True,
+        status_choices=STATUS_CHOICES,
+        classes=("karbor-status",))
 
     class Meta(object):
         name = 'checkpoints'
         verbose_name = _('Checkpoints')
+        status_columns = ["status"]
         row_actions = (RestoreCheckpointLink, DeleteCheckpointsAction)
 
 
@@ -20,10 +20,19 @@ urlpatterns = [
     url(r'^$', views.IndexView.as_view(), name='index'),
     url(r'^(?P<provider_id>[^/]+)/$',
         views.IndexView.as_view(), name='index'),
+    url(r'^(?P<provider_id>[^/]+)/list/$',
+        views.ListView.as_view(), name='list'),
+    url(r'^(?P<provider_id>[^/]+)/statuses/$',
+        views.StatusesView.as_view(), name='statuses'),
+    url(r'^(?P<provider_id>[^/]+)/statuses/stream/$',
+        views.StatusStreamView.as_view(), name='statuses_stream'),
     url(r'^(?P<provider_id>[^/]+)/checkpoints/'
         r'(?P<checkpoint_id>[^/]+)/restore$',
         views.CheckpointsRestoreView.as_view(), name='restore'),
     url(r'^(?P<provider_id>[^/]+)/checkpoints/'
         r'(?P<checkpoint_id>[^/]+)/detail/$',
         views.DetailView.as_view(), name='detail'),
+    url(r'^(?P<provider_id>[^/]+)/checkpoints/'
+        r'(?P<checkpoint_id>[^/]+)/resources/$',
+        views.ResourcesView.as_view(), name='resources'),
 ]
@@ -14,8 +14,14 @@
 
 import collections
 from collections import namedtuple
+from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
+from horizon.utils import memoized
 import json
+import threading
+import time
+
+from karbor_dashboard.api import karbor as karborclient
 
 FILTER_LIST = ['provider_filter', 'plan_filter', 'date_filter']
 
@@ -32,58 +38,196 @@ DATE_CHOICES = [(TODAY, _('Today')),
                 (LASTESTTHREEMONTHS, _('Lastest three months'))]
 DATE_DICT = collections.OrderedDict(DATE_CHOICES)
 
-Resource = namedtuple("Resource", (
-    'type',
-    'id',
-    'name'
+ResourceRow = namedtuple("ResourceRow", (
+    "id",
+    "type",
+    "name",
+    "showid",
+    "showparentid",
+    "has_children",
 ))
-GraphNode = namedtuple("GraphNode", (
-    "value",
-    "child_nodes",
+
+ResourceTree = namedtuple("ResourceTree", (
+    "nodes",
+    "children",
+    "roots",
+    "positions",
 ))
 
-PackedGraph = namedtuple('PackedGraph', ['nodes', 'adjacency'])
+# Number of children of a resource graph node rendered at a time.
+RESOURCE_PAGE_SIZE = 100
+
+
+
+class ResourceTreeCache(object):
+    """A process local, size bound cache of parsed resource trees.
+
+    Trees are kept for ``KARBOR_RESOURCE_TREE_CACHE_TTL`` seconds. The
+    least recently used ones are dropped once the cached trees hold more
+    than ``KARBOR_RESOURCE_TREE_CACHE_MAX_NODES`` nodes altogether, and a
+    tree larger than that is not cached at all. Trees are kept as parsed,
+    so a hit costs neither a download nor a deserialization.
+    """
+
+    def __init__(self, ttl=60, max_nodes=200000):
+        self.default_ttl = ttl
+        self.default_max_nodes = max_nodes
+        self._trees = collections.OrderedDict()
+        self._nodes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'KARBOR_RESOURCE_TREE_CACHE_TTL',
+                       self.default_ttl)
+
+    @property
+    def max_nodes(self):
+        return getattr(settings, 'KARBOR_RESOURCE_TREE_CACHE_MAX_NODES',
+                       self.default_max_nodes)
+
+    def _drop(self, key):
+        tree, _expires = self._trees.pop(key)
+        self._nodes -= len(tree.nodes)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._trees.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                self._drop(key)
+                return None
+            # Mark it as the most recently used.
+            del self._trees[key]
+            self._trees[key] = entry
+            return entry[0]
+
+    def set(self, key, tree):
+        max_nodes = self.max_nodes
+        with self._lock:
+            if key in self._trees:
+                self._drop(key)
+            if len(tree.nodes) > max_nodes:
+                return
+            self._trees[key] = (tree, time.time() + self.ttl)
+            self._nodes += len(tree.nodes)
+            while self._nodes > max_nodes:
+                self._drop(next(iter(self._trees)))
+
+    def clear(self):
+        with self._lock:
+            self._trees.clear()
+            self._nodes = 0
+
+    def __len__(self):
+        return len(self._trees)
+
+
+# The resource trees of the checkpoints being browsed, shared by the
+# requests of this process that page through them.
+RESOURCE_TREE_CACHE = ResourceTreeCache()
 
 
-def deserialize_resource_graph(serialized_resource_graph):
-    deserialized_graph = json.loads(serialized_resource_graph)
-    packed_resource_graph = PackedGraph(nodes=deserialized_graph[0],
-                                        adjacency=deserialized_graph[1])
-    for sid, node in packed_resource_graph.nodes.items():
-        packed_resource_graph.nodes[sid] = Resource(type=node[0],
-                                                    id=node[1],
-                                                    name=node[2])
-    resource_graph = unpack_graph(packed_resource_graph)
-    return resource_graph
+@memoized.memoized
+def get_provider(request, provider_id):
+    """Return the provider, fetched at most once per request."""
+    return karborclient.provider_get(request, provider_id)
 
 
-def unpack_graph(packed_graph):
-    """Return a list of GraphNodes from a PackedGraph
+@memoized.memoized
+def get_checkpoint(request, provider_id, checkpoint_id):
+    """Return the checkpoint, fetched at most once per request."""
+    return karborclient.checkpoint_get(request, provider_id, checkpoint_id)
 
-    Unpacks a PackedGraph, which must have the property: each parent node in
-    the adjacency list appears after its children.
+
+@memoized.memoized
+def get_resource_tree(request, provider_id, checkpoint_id):
+    """Return the resource graph of the checkpoint as a ResourceTree.
+
+    The tree is kept in RESOURCE_TREE_CACHE, per project, so expanding
+    the nodes of a checkpoint does not download and deserialize its graph
+    again for every page of children.
     """
-    (nodes, adjacency_list) = packed_graph
-    nodes_dict = dict(nodes)
-    graph_nodes_dict = {}
-
-    for (parent_sid, children_sids) in adjacency_list:
-        if parent_sid in graph_nodes_dict:
-            raise Exception("PackedGraph adjacency list "
-                            "must be topologically ordered")
-        children = []
-        for child_sid in children_sids:
-            if child_sid not in graph_nodes_dict:
-                graph_nodes_dict[child_sid] = GraphNode(
-                    nodes_dict[child_sid], ())
-            children.append(graph_nodes_dict[child_sid])
-            del(nodes_dict[child_sid])
-        graph_nodes_dict[parent_sid] = GraphNode(nodes_dict[parent_sid],
-                                                 tuple(children))
-
-    result_nodes = []
-    for sid in nodes_dict:
-        if sid not in graph_nodes_dict:
-            graph_nodes_dict[sid] = GraphNode(nodes_dict[sid], ())
-        result_nodes.append(graph_nodes_dict[sid])
-    return result_nodes
+    key = (request.user.tenant_id, provider_id, checkpoint_id)
+    tree = RESOURCE_TREE_CACHE.get(key)
+    if tree is None:
+        checkpoint = get_checkpoint(request, provider_id, checkpoint_id)
+        tree = build_resource_tree(checkpoint.resource_graph)
+        RESOURCE_TREE_CACHE.set(key, tree)
+    return tree
+
+
+def build_resource_tree(serialized_resource_graph):
+    """Return the ResourceTree of a serialized resource graph.
+
+    The serialized graph is a ``[nodes, adjacency]`` pair, where ``nodes``
+    maps node ids to ``[type, id, name]`` and ``adjacency`` lists
+    ``[parent_id, [child_id, ...]]`` pairs. The node ids of the packed
+    graph are used as row ids, so the ids of a checkpoint are the same on
+    every page load.
+    """
+    nodes, adjacency = json.loads(serialized_resource_graph)
+    children = dict(adjacency)
+    child_sids = set()
+    for child_list in children.values():
+        child_sids.update(child_list)
+    roots = tuple(sorted(sid for sid in nodes if sid not in child_sids))
+    # The position of every node among its siblings, keyed by parent.
+    positions = dict((parent_sid, _index(child_list))
+                     for parent_sid, child_list in children.items())
+    positions[None] = _index(roots)
+    return ResourceTree(nodes=nodes, children=children, roots=roots,
+                        positions=positions)
+
+
+def _index(sids):
+    return dict((sid, position) for position, sid in enumerate(sids))
+
+
+def get_resource_page(request, provider_id, checkpoint_id, parent_sid=None,
+                      marker=None, limit=None):
+    """Return one page of the children of a resource graph node.
+
+    The top level resources are returned when no ``parent_sid`` is given.
+    ``marker`` is the marker returned with the previous page, the graph
+    node id (``showid``) of its last resource. Returns a list of
+    ResourceRow and the marker of the next page, which is None on the
+    last page.
+    """
+    tree = get_resource_tree(request, provider_id, checkpoint_id)
+    return get_tree_page(tree, parent_sid=parent_sid, marker=marker,
+                         limit=limit)
+
+
+def get_tree_page(tree, parent_sid=None, marker=None, limit=None):
+    """Return one page of the children of a node of a ResourceTree.
+
+    See get_resource_page(). Raises ValueError if ``parent_sid`` is not
+    a node of the tree or ``marker`` is not one of its children.
+    """
+    if parent_sid is None:
+        sids = tree.roots
+    elif parent_sid in tree.nodes:
+        sids = tree.children.get(parent_sid, ())
+    else:
+        raise ValueError("Unknown resource %r" % parent_sid)
+    if marker is None:
+        start = 0
+    else:
+        position = tree.positions.get(parent_sid, {}).get(marker)
+        if position is None:
+            raise ValueError("Invalid marker %r" % marker)
+        start = position + 1
+    limit = limit or getattr(settings, 'KARBOR_RESOURCE_PAGE_SIZE',
+                             RESOURCE_PAGE_SIZE)
+
+    page = sids[start:start + limit]
+    rows = []
+    for sid in page:
+        node = tree.nodes[sid]
+        rows.append(ResourceRow(id=node[1], type=node[0], name=node[2],
+                                showid=sid, showparentid=parent_sid,
+                                has_children=bool(tree.children.get(sid))))
+    next_marker = page[-1] if start + limit < len(sids) else None
+    return rows, next_marker
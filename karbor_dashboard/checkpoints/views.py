@@ -12,11 +12,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import uuid
+import logging
 
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
+from django import http
+from django.utils.encoding import force_text
+from django.utils.http import urlencode
 from django.utils.translation import ugettext_lazy as _
+from django.views import generic
 
 from calendar import monthrange
 from datetime import date
@@ -30,11 +34,54 @@ from karbor_dashboard.api import karbor as karborclient
 from karbor_dashboard.checkpoints import forms
 from karbor_dashboard.checkpoints import tables
 from karbor_dashboard.checkpoints import utils
-from karborclient.v1 import protectables
-
-
-class IndexView(horizon_tables.DataTableView):
+from karbor_dashboard import views as karbor_views
+
+LOG = logging.getLogger(__name__)
+
+
+def build_search_opts(plan_id, date_filter):
+    """Return the checkpoint search options of the plan and date filters."""
+    def _total_days(year, month, num_months):
+        days = 0
+        i = 0
+        while i < num_months:
+            days += monthrange(year, month)[1]
+            month = month - 1 if month > 1 else 12
+            year = year if month > 1 else year - 1
+            i += 1
+        return days
+
+    search_opts = {}
+    if plan_id != u"All":
+        search_opts["plan_id"] = plan_id
+
+    now = date.today()
+    if date_filter == utils.TODAY:
+        delta = timedelta(days=1)
+    elif date_filter == utils.LASTESTONEWEEK:
+        delta = timedelta(weeks=1)
+    elif date_filter == utils.LASTESTTWOWEEKS:
+        delta = timedelta(weeks=2)
+    elif date_filter == utils.LASTESTONEMONTH:
+        days = _total_days(now.year, now.month, 1)
+        delta = timedelta(days=days)
+    elif date_filter == utils.LASTESTTHREEMONTHS:
+        days = _total_days(now.year, now.month, 3)
+        delta = timedelta(days=days)
+    else:
+        delta = None
+
+    if delta:
+        search_opts["start_date"] = now - delta
+        search_opts["end_date"] = now
+
+    return search_opts
+
+
+class IndexView(karbor_views.PrefetchPagesMixin,
+                horizon_tables.DataTableView):
     table_class = tables.CheckpointsTable
+    enriched_attrs = ('provider_name', 'provider_id')
     template_name = 'checkpoints/index.html'
     page_title = _("Checkpoints")
 
@@ -82,48 +129,28 @@ class IndexView(horizon_tables.DataTableView):
         context["plan_list"] = self.get_plan_list()
         context["date_list"] = utils.DATE_CHOICES
         context["url"] = reverse("horizon:karbor:checkpoints:index")
+        context["status_stream"] = karbor_views.status_stream_enabled()
         context = dict(context, **self.get_filter_list())
+
+        # Further pages are appended by the table as the user scrolls.
+        provider_id = context.get(utils.FILTER_LIST[0])
+        checkpoints = self.get_table().data
+        if provider_id and checkpoints and getattr(self, '_more', False):
+            query = dict((key, context[key]) for key in utils.FILTER_LIST[1:]
+                         if context.get(key))
+            context["list_url"] = "%s?%s" % (
+                reverse("horizon:karbor:checkpoints:list",
+                        args=(provider_id,)),
+                urlencode(query))
+            context["next_marker"] = checkpoints[-1].id
         return context
 
     def get_search_opts(self):
-        def _total_days(year, month, num_months):
-            days = 0
-            i = 0
-            while i < num_months:
-                days += monthrange(year, month)[1]
-                month = month - 1 if month > 1 else 12
-                year = year if month > 1 else year - 1
-                i += 1
-            return days
-
-        search_opts = {}
         filters = self.get_filter_list()
         provider_id = filters.get(utils.FILTER_LIST[0], None)
-        plan_id = filters.get(utils.FILTER_LIST[1], u"All")
-        if plan_id != u"All":
-            search_opts["plan_id"] = plan_id
-
-        now = date.today()
-        date_filter = filters.get(utils.FILTER_LIST[2], None)
-        if date_filter == utils.TODAY:
-            delta = timedelta(days=1)
-        elif date_filter == utils.LASTESTONEWEEK:
-            delta = timedelta(weeks=1)
-        elif date_filter == utils.LASTESTTWOWEEKS:
-            delta = timedelta(weeks=2)
-        elif date_filter == utils.LASTESTONEMONTH:
-            days = _total_days(now.year, now.month, 1)
-            delta = timedelta(days=days)
-        elif date_filter == utils.LASTESTTHREEMONTHS:
-            days = _total_days(now.year, now.month, 3)
-            delta = timedelta(days=days)
-        else:
-            delta = None
-
-        if delta:
-            search_opts["start_date"] = now - delta
-            search_opts["end_date"] = now
-
+        search_opts = build_search_opts(
+            filters.get(utils.FILTER_LIST[1], u"All"),
+            filters.get(utils.FILTER_LIST[2], None))
         return provider_id, search_opts
 
     def has_prev_data(self, table):
@@ -145,28 +172,8 @@ class IndexView(horizon_tables.DataTableView):
         reversed_order = prev_marker is not None
         checkpoints = []
         try:
-            # Get provider id and search_opts
-            provider_id, search_opts = self.get_search_opts()
-            if provider_id is None:
-                raise Exception()
-
-            checkpoints, self._more, self._prev = \
-                karborclient.checkpoint_list_paged(
-                    self.request,
-                    provider_id=provider_id,
-                    search_opts=search_opts,
-                    marker=marker,
-                    paginate=True,
-                    sort_dir='asc',
-                    sort_key='name',
-                    reversed_order=reversed_order)
-            for checkpoint in checkpoints:
-                provider = karborclient.provider_get(
-                    self.request,
-                    checkpoint.protection_plan['provider_id']
-                )
-                setattr(checkpoint, "provider_name", provider.name)
-                setattr(checkpoint, "provider_id", provider.id)
+            checkpoints, self._more, self._prev = self.get_page(
+                marker, reversed_order)
         except Exception:
             self._prev = False
             self._more = False
@@ -174,6 +181,37 @@ class IndexView(horizon_tables.DataTableView):
                               _('Unable to retrieve checkpoints list.'))
         return checkpoints
 
+    def get_prefetch_params(self):
+        return self.get_search_opts()
+
+    @classmethod
+    def load_page(cls, request, params, marker, reversed_order):
+        # Get provider id and search_opts
+        provider_id, search_opts = params
+        if provider_id is None:
+            raise Exception()
+
+        checkpoints, has_more_data, has_prev_data = \
+            karborclient.checkpoint_list_paged(
+                request,
+                provider_id=provider_id,
+                search_opts=search_opts,
+                marker=marker,
+                paginate=True,
+                sort_dir='asc',
+                sort_key='name',
+                reversed_order=reversed_order)
+        providers = karborclient.provider_get_bulk(
+            request,
+            [checkpoint.protection_plan['provider_id']
+             for checkpoint in checkpoints],
+            providers=karborclient.provider_list(request))
+        for checkpoint in checkpoints:
+            provider = providers[checkpoint.protection_plan['provider_id']]
+            setattr(checkpoint, "provider_name", provider.name)
+            setattr(checkpoint, "provider_id", provider.id)
+        return checkpoints, has_more_data, has_prev_data
+
 
 class CheckpointsRestoreView(horizon_forms.ModalFormView):
     template_name = 'checkpoints/restore.html'
@@ -196,47 +234,31 @@ class CheckpointsRestoreView(horizon_forms.ModalFormView):
             checkpoint_id = self.kwargs['checkpoint_id']
             context['provider_id'] = provider_id
             context['checkpoint_id'] = checkpoint_id
-            context["instances"] = self.get_resources()
+            context["instances"], context["resources_marker"] = \
+                self.get_resources()
             context['submit_url'] = reverse(self.submit_url,
                                             args=(provider_id, checkpoint_id))
+            context['schemas_url'] = "%s?%s" % (
+                reverse("horizon:karbor:protectionproviders:schemas",
+                        args=("restore_schema",)),
+                urlencode({"provider_id": provider_id}))
             return context
 
     @memoized.memoized_method
     def get_resources(self):
         results = []
+        marker = None
         try:
-            provider_id = self.kwargs['provider_id']
-            checkpoint_id = self.kwargs['checkpoint_id']
-            checkpoint = karborclient.checkpoint_get(self.request,
-                                                     provider_id,
-                                                     checkpoint_id)
-            graphnodes = utils.deserialize_resource_graph(
-                checkpoint.resource_graph)
-            self.get_results(graphnodes, None, results)
+            results, marker = utils.get_resource_page(
+                self.request,
+                self.kwargs['provider_id'],
+                self.kwargs['checkpoint_id'])
         except Exception:
             exceptions.handle(
                 self.request,
                 _('Unable to retrieve checkpoint details.'),
                 redirect=reverse("horizon:karbor:checkpoints:index"))
-        return results
-
-    def get_results(self, graphnodes, showparentid, results):
-        for graphnode in graphnodes:
-            if graphnode is not None:
-                # add graph node to results
-                resource = {}
-                resource["id"] = graphnode.value.id
-                resource["type"] = graphnode.value.type
-                resource["name"] = graphnode.value.name
-                resource["showid"] = str(uuid.uuid4())
-                resource["showparentid"] = showparentid
-                result = protectables.Instances(self, resource)
-                results.append(result)
-                # add child graph nodes to results
-                self.get_results(graphnode.child_nodes,
-                                 result.showid,
-                                 results
-                                 )
+        return results, marker
 
 
 class DetailView(horizon_tables.DataTableView):
@@ -249,9 +271,9 @@ class DetailView(horizon_tables.DataTableView):
         try:
             provider_id = self.kwargs['provider_id']
             checkpoint_id = self.kwargs['checkpoint_id']
-            checkpoint = karborclient.checkpoint_get(self.request,
-                                                     provider_id,
-                                                     checkpoint_id)
+            checkpoint = utils.get_checkpoint(self.request,
+                                              provider_id,
+                                              checkpoint_id)
         except Exception:
             checkpoint = []
             msg = _('checkpoint list can not be retrieved.')
@@ -263,45 +285,105 @@ class DetailView(horizon_tables.DataTableView):
         checkpoint = self.get_checkpoint_data()
         context["checkpoint"] = checkpoint
         provider_id = self.kwargs['provider_id']
-        provider = karborclient.provider_get(self.request, provider_id)
+        provider = utils.get_provider(self.request, provider_id)
         context["provider_name"] = provider.name
-        context["resources"] = self.get_resources()
+        context["provider_id"] = provider_id
+        context["checkpoint_id"] = self.kwargs['checkpoint_id']
+        context["resources"], context["resources_marker"] = \
+            self.get_resources()
         context["url"] = reverse("horizon:karbor:protectionplans:index")
         return context
 
     @memoized.memoized_method
     def get_resources(self):
         results = []
+        marker = None
         try:
-            provider_id = self.kwargs['provider_id']
-            checkpoint_id = self.kwargs['checkpoint_id']
-            checkpoint = karborclient.checkpoint_get(self.request,
-                                                     provider_id,
-                                                     checkpoint_id)
-            graphnodes = utils.deserialize_resource_graph(
-                checkpoint.resource_graph)
-            self.get_results(graphnodes, None, results)
+            results, marker = utils.get_resource_page(
+                self.request,
+                self.kwargs['provider_id'],
+                self.kwargs['checkpoint_id'])
         except Exception:
             exceptions.handle(
                 self.request,
                 _('Unable to retrieve checkpoint details.'),
                 redirect=reverse("horizon:karbor:checkpoints:index"))
-        return results
-
-    def get_results(self, graphnodes, showparentid, results):
-        for graphnode in graphnodes:
-            if graphnode is not None:
-                # add graph node to results
-                resource = {}
-                resource["id"] = graphnode.value.id
-                resource["type"] = graphnode.value.type
-                resource["name"] = graphnode.value.name
-                resource["showid"] = str(uuid.uuid4())
-                resource["showparentid"] = showparentid
-                result = protectables.Instances(self, resource)
-                results.append(result)
-                # add child graph nodes to results
-                self.get_results(graphnode.child_nodes,
-                                 result.showid,
-                                 results
-                                 )
+        return results, marker
+
+
+class ResourcesView(generic.View):
+    """Return one page of the children of a checkpoint resource graph node.
+
+    Used by the resource trees of the checkpoint detail and restore pages,
+    which only render the top level resources and load the children of a
+    node when it is expanded.
+    """
+
+    def get(self, request, provider_id, checkpoint_id):
+        try:
+            tree = utils.get_resource_tree(request, provider_id,
+                                           checkpoint_id)
+        except Exception:
+            LOG.exception('Unable to retrieve the resources of checkpoint '
+                          '%s.', checkpoint_id)
+            return http.JsonResponse(
+                {"error": force_text(
+                    _('Unable to retrieve checkpoint details.'))},
+                status=500)
+        try:
+            rows, marker = utils.get_tree_page(
+                tree,
+                parent_sid=request.GET.get('parent') or None,
+                marker=request.GET.get('marker') or None)
+        except ValueError as e:
+            return http.JsonResponse({"error": force_text(e)}, status=400)
+        return http.JsonResponse({
+            "resources": [row._asdict() for row in rows],
+            "marker": marker,
+        })
+
+
+class ListView(generic.View):
+    """Return a page of the checkpoints of a provider as table rows.
+
+    Used by the checkpoints table to append the following pages as the
+    user scrolls. The rows are rendered by the checkpoints table, so they
+    carry the same selection checkbox and row actions as the first page,
+    and the marker of the next page is None on the last page.
+    """
+
+    def get(self, request, provider_id):
+        search_opts = build_search_opts(
+            request.GET.get(utils.FILTER_LIST[1], u"All"),
+            request.GET.get(utils.FILTER_LIST[2], None))
+        try:
+            checkpoints, has_more_data, has_prev_data = IndexView.load_page(
+                request, (provider_id, search_opts),
+                request.GET.get('marker') or None, False)
+        except Exception:
+            LOG.exception('Unable to retrieve the checkpoints of provider '
+                          '%s.', provider_id)
+            return http.JsonResponse(
+                {"error": force_text(
+                    _('Unable to retrieve checkpoints list.'))},
+                status=500)
+
+        marker = None
+        if has_more_data and checkpoints:
+            marker = checkpoints[-1].id
+        table = tables.CheckpointsTable(request, data=checkpoints)
+        return http.JsonResponse({
+            "rows": [force_text(row.render()) for row in table.get_rows()],
+            "marker": marker,
+        })
+
+
+class StatusesView(karbor_views.StatusesView):
+    status_choices = tables.STATUS_CHOICES
+
+    def get_statuses(self, request, ids, provider_id):
+        return karborclient.checkpoint_get_statuses(request, provider_id, ids)
+
+
+class StatusStreamView(karbor_views.StatusStreamView, StatusesView):
+    kind = 'checkpoints'
@@ -12,18 +12,60 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
+from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 
+from horizon import exceptions
 from horizon import tables as horizon_tables
 
+from karbor_dashboard.api import karbor as karborclient
 from karbor_dashboard.operationlogs import tables
 
+# Hours of operation logs listed by default.
+DEFAULT_WINDOW = 24
+
 
 class IndexView(horizon_tables.DataTableView):
     table_class = tables.OperationLogsTable
     template_name = 'operationlogs/index.html'
     page_title = _("Operation Logs")
 
+    def has_prev_data(self, table):
+        return self._prev
+
+    def has_more_data(self, table):
+        return self._more
+
     def get_data(self):
+        request = self.request
+        prev_marker = request.GET.get(
+            tables.OperationLogsTable._meta.prev_pagination_param, None)
+
+        if prev_marker is not None:
+            marker = prev_marker
+        else:
+            marker = request.GET.get(
+                tables.OperationLogsTable._meta.pagination_param, None)
+        reversed_order = prev_marker is not None
+        window = getattr(settings, 'KARBOR_OPERATION_LOG_WINDOW',
+                         DEFAULT_WINDOW)
         logs = []
+        try:
+            logs, self._more, self._prev = \
+                karborclient.operation_log_list_paged(
+                    request,
+                    marker=marker,
+                    paginate=True,
+                    sort_dir='desc',
+                    sort_key='actual_start_time',
+                    reversed_order=reversed_order,
+                    since=(datetime.datetime.utcnow() -
+                           datetime.timedelta(hours=window)))
+        except Exception:
+            self._prev = False
+            self._more = False
+            exceptions.handle(self.request,
+                              _('Unable to retrieve operation logs list.'))
         return logs
@@ -29,8 +29,6 @@ class CreateProtectionPlanForm(horizon_forms.SelfHandlingForm):
                                     choices=[],
                                     widget=forms.Select(attrs={
                                         'class': 'switchable'}))
-    providers = forms.CharField(
-        widget=forms.HiddenInput(attrs={"class": "providers"}))
     actionmode = forms.CharField(
         widget=forms.HiddenInput(attrs={"class": "actionmode"}))
     resources = forms.CharField(
@@ -45,10 +43,6 @@ class CreateProtectionPlanForm(horizon_forms.SelfHandlingForm):
 
         result = []
         providers = karborclient.provider_list(request)
-
-        self.fields['providers'].initial = \
-            json.dumps([f._info for f in providers])
-
         if providers:
             result = [(e.id, e.name) for e in providers]
 
@@ -12,14 +12,19 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import logging
+
 from django.utils.translation import ugettext_lazy as _
 from django.utils.translation import ungettext_lazy
 
-from horizon import exceptions
 from horizon import messages
 from horizon import tables
 
 from karbor_dashboard.api import karbor as karborclient
+from karbor_dashboard.api import utils as api_utils
+from karbor_dashboard import tables as karbor_tables
+
+LOG = logging.getLogger(__name__)
 
 
 class CreateProtectionPlanLink(tables.LinkAction):
@@ -51,23 +56,54 @@ class ProtectNowLink(tables.Action):
         return True
 
     def handle(self, table, request, obj_ids):
+        """Create a checkpoint of every selected plan.
+
+        The checkpoints are created concurrently, at most
+        ``KARBOR_BULK_ACTION_MAX_WORKERS`` at a time, and the outcome is
+        reported in one message per result instead of one per plan.
+        """
+        data = dict((table.get_object_id(datum), datum)
+                    for datum in table.data)
+        selected = []
         for datum_id in obj_ids:
-            self.action(request, datum_id)
-
-    def action(self, request, datum_id):
-        try:
-            datum = self.table.get_object_by_id(datum_id)
-            provider_id = datum.provider_id
-            new_checkpoint = karborclient.checkpoint_create(request,
-                                                            provider_id,
-                                                            datum_id)
-            messages.success(request, _("Plan protection initiated"))
-            return new_checkpoint
-        except Exception:
-            exceptions.handle(request, _('Unable to protect now'))
-
-
-class DeleteProtectionPlansAction(tables.DeleteAction):
+            datum = data.get(datum_id)
+            if datum is None:
+                datum = table.get_object_by_id(datum_id)
+            selected.append((datum_id, datum,
+                             table.get_object_display(datum) or datum_id))
+        results = api_utils.concurrent_map(
+            self.action,
+            [(request, datum_id, datum) for datum_id, datum, _d in selected],
+            max_workers=api_utils.get_bulk_action_max_workers(),
+            raise_errors=False)
+
+        protected, failed = [], []
+        for (datum_id, datum, datum_display), result in zip(selected,
+                                                            results):
+            if isinstance(result, Exception):
+                karbor_tables.handle_error(request, result)
+                LOG.warning(u'Unable to protect plan "%(dis)s": %(reason)s',
+                            {'dis': datum_display, 'reason': result})
+                failed.append(datum_display)
+            else:
+                protected.append(datum_display)
+        if protected:
+            messages.success(request,
+                             _("Plan protection initiated: %s")
+                             % karbor_tables.join_displays(protected))
+        if failed:
+            messages.error(request,
+                           _("Unable to protect now: %s")
+                           % karbor_tables.join_displays(failed))
+
+    def action(self, request, datum_id, datum):
+        return karborclient.checkpoint_create(request,
+                                              datum.provider_id,
+                                              datum_id)
+
+
+class DeleteProtectionPlansAction(karbor_tables.ConcurrentDeleteMixin,
+                                  tables.DeleteAction):
     @staticmethod
     def action_present(count):
         return ungettext_lazy(
@@ -92,11 +128,8 @@ class DeleteProtectionPlansAction(tables.DeleteAction):
 
 
 class ProtectionPlanFilterAction(tables.FilterAction):
-    def filter(self, table, protectionplans, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [protectionplan for protectionplan in protectionplans
-                if query in protectionplan.name.lower()]
+    filter_type = "server"
+    filter_choices = (('name', _("Name ="), True),)
 
 
 class ProtectionPlansTable(tables.DataTable):
@@ -113,7 +146,7 @@ class ProtectionPlansTable(tables.DataTable):
         row_actions = (ScheduleProtectLink, ProtectNowLink,
                        DeleteProtectionPlansAction)
         table_actions = (ProtectionPlanFilterAction, CreateProtectionPlanLink,
-                         DeleteProtectionPlansAction)
+                         ProtectNowLink, DeleteProtectionPlansAction)
 
 
 class DetailTable(tables.DataTable):
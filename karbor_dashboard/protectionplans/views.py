@@ -12,12 +12,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon import forms as horizon_forms
+from horizon import messages
 from horizon import tables as horizon_tables
 from horizon.utils import memoized
 from horizon import views as horizon_views
@@ -25,11 +27,17 @@ from horizon import views as horizon_views
 from karbor_dashboard.api import karbor as karborclient
 from karbor_dashboard.protectionplans import forms
 from karbor_dashboard.protectionplans import tables
+from karbor_dashboard import views as karbor_views
 from karborclient.v1 import protectables
 import uuid
 
+# Limits of the resource tree shown by the Create Protection Plan form.
+RESOURCE_TREE_MAX_DEPTH = 10
+RESOURCE_TREE_MAX_NODES = 1000
 
-class IndexView(horizon_tables.DataTableView):
+
+class IndexView(karbor_views.PrefetchPagesMixin,
+                horizon_tables.DataTableView):
     table_class = tables.ProtectionPlansTable
     template_name = 'protectionplans/index.html'
     page_title = _("Protection Plans")
@@ -53,13 +61,8 @@ class IndexView(horizon_tables.DataTableView):
         reversed_order = prev_marker is not None
         plans = []
         try:
-            plans, self._more, self._prev = karborclient.plan_list_paged(
-                request, None,
-                marker=marker,
-                paginate=True,
-                sort_dir='asc',
-                sort_key='name',
-                reversed_order=reversed_order)
+            plans, self._more, self._prev = self.get_page(marker,
+                                                          reversed_order)
         except Exception:
             self._prev = False
             self._more = False
@@ -67,6 +70,20 @@ class IndexView(horizon_tables.DataTableView):
                               _('Unable to retrieve protection plans list.'))
         return plans
 
+    def get_prefetch_params(self):
+        return karbor_views.get_search_opts(self.table)
+
+    @classmethod
+    def load_page(cls, request, params, marker, reversed_order):
+        return karborclient.plan_list_paged(
+            request, None,
+            search_opts=params,
+            marker=marker,
+            paginate=True,
+            sort_dir='asc',
+            sort_key='name',
+            reversed_order=reversed_order)
+
 
 class CreateView(horizon_forms.ModalFormView):
     template_name = 'protectionplans/create.html'
@@ -81,6 +98,9 @@ class CreateView(horizon_forms.ModalFormView):
     def get_context_data(self, **kwargs):
         context = super(CreateView, self).get_context_data(**kwargs)
         context["instances"] = self.get_object()
+        context["schemas_url"] = reverse(
+            "horizon:karbor:protectionproviders:schemas",
+            args=("options_schema",))
         return context
 
     def get_form_kwargs(self):
@@ -93,34 +113,88 @@ class CreateView(horizon_forms.ModalFormView):
         try:
             instances = karborclient.protectable_list_instances(
                 self.request, "OS::Keystone::Project")
-            results = []
-            self.get_results(instances, None, results)
-            return results
+            return self.get_results(instances)
         except Exception:
             exceptions.handle(
                 self.request,
                 _('Unable to create protection plan.'),
                 redirect=reverse("horizon:karbor:protectionplans:index"))
 
-    def get_results(self, instances, showparentid, results):
-        for instance in instances:
-            if instance is not None:
-                resource = {}
-                resource["id"] = instance.id
-                resource["type"] = instance.type
-                resource["name"] = instance.name
-                resource["showid"] = str(uuid.uuid4())
-                resource["showparentid"] = showparentid
-                result = protectables.Instances(self, resource)
-                results.append(result)
-
-                for dependent_resource in instance.dependent_resources:
-                    if dependent_resource is not None:
-                        dependent = karborclient.protectable_get_instance(
-                            self.request,
-                            dependent_resource["type"],
-                            dependent_resource["id"])
-                        self.get_results([dependent], result.showid, results)
+    def get_results(self, instances):
+        """Return the rows of the resource tree rooted at instances.
+
+        The dependencies are resolved one level at a time, fetching every
+        distinct protectable instance once and each level concurrently.
+        The walk is capped by KARBOR_PLAN_RESOURCE_MAX_DEPTH and
+        KARBOR_PLAN_RESOURCE_MAX_NODES.
+        """
+        max_depth = getattr(settings, 'KARBOR_PLAN_RESOURCE_MAX_DEPTH',
+                            RESOURCE_TREE_MAX_DEPTH)
+        max_nodes = getattr(settings, 'KARBOR_PLAN_RESOURCE_MAX_NODES',
+                            RESOURCE_TREE_MAX_NODES)
+        roots = [instance for instance in instances if instance is not None]
+        known = dict(((instance.type, instance.id), instance)
+                     for instance in roots)
+        truncated = False
+
+        level = roots
+        for depth in range(max_depth + 1):
+            keys = []
+            for instance in level:
+                for dependent in instance.dependent_resources:
+                    if dependent is None:
+                        continue
+                    key = (dependent["type"], dependent["id"])
+                    if key not in known:
+                        known[key] = None
+                        keys.append(key)
+            if not keys:
+                break
+            if depth == max_depth or len(known) > max_nodes:
+                truncated = True
+                keys = keys[:max(0, max_nodes - len(known) + len(keys))]
+                if depth == max_depth or not keys:
+                    break
+            fetched = karborclient.protectable_get_instances_bulk(
+                self.request, keys)
+            known.update(fetched)
+            level = [fetched[key] for key in keys]
+
+        results = []
+        stack = [(instance, None, ()) for instance in reversed(roots)]
+        while stack:
+            if len(results) >= max_nodes:
+                truncated = True
+                break
+            instance, showparentid, path = stack.pop()
+            resource = {}
+            resource["id"] = instance.id
+            resource["type"] = instance.type
+            resource["name"] = instance.name
+            resource["showid"] = str(uuid.uuid4())
+            resource["showparentid"] = showparentid
+            result = protectables.Instances(self, resource)
+            results.append(result)
+
+            path += ((instance.type, instance.id),)
+            if len(path) > max_depth:
+                continue
+            dependents = []
+            for dependent in instance.dependent_resources:
+                if dependent is None:
+                    continue
+                key = (dependent["type"], dependent["id"])
+                # Skip unresolved dependencies and cycles.
+                if known.get(key) is not None and key not in path:
+                    dependents.append((known[key], result.showid, path))
+            stack.extend(reversed(dependents))
+
+        if truncated:
+            messages.warning(
+                self.request,
+                _('Only part of the protectable resources are shown, the '
+                  'resource tree is too large.'))
+        return results
 
 
 class ScheduleProtectView(horizon_forms.ModalFormView):
@@ -197,25 +271,44 @@ class DetailView(horizon_views.HorizonTemplateView):
 
     @memoized.memoized_method
     def get_instances(self, instances):
-        try:
-            result = []
-            for instance in instances:
-                instance["showid"] = str(uuid.uuid4())
-                result.append(protectables.Instances(self, instance))
-                detail_instance = karborclient.protectable_get_instance(
-                    self.request,
-                    instance["type"].strip(),
-                    instance["id"].strip())
-                if detail_instance.dependent_resources:
-                    for dependent in detail_instance.dependent_resources:
-                        dependent["showid"] = str(uuid.uuid4())
-                        dependent["showparentid"] = instance["showid"]
-                        result.append(
-                            protectables.Instances(self, dependent))
-            return result
+        """Return the rows of the plan resources and their dependents.
 
+        The resources are looked up concurrently, once per distinct
+        (type, id) pair. A resource whose lookup fails is still listed,
+        only without its dependent resources.
+        """
+        try:
+            keys = [(instance["type"].strip(), instance["id"].strip())
+                    for instance in instances]
+            details = karborclient.protectable_get_instances_bulk(
+                self.request, keys, raise_errors=False)
         except Exception:
             exceptions.handle(
                 self.request,
                 _('Unable to get instances.'),
                 redirect=reverse("horizon:karbor:protectionplans:index"))
+
+        result = []
+        failed = []
+        for instance, key in zip(instances, keys):
+            detail_instance = details[key]
+            instance["showid"] = str(uuid.uuid4())
+            instance["showparentid"] = None
+            instance["unavailable"] = isinstance(detail_instance, Exception)
+            result.append(protectables.Instances(self, instance))
+            if instance["unavailable"]:
+                failed.append(instance.get("name") or instance["id"])
+                continue
+            for dependent in detail_instance.dependent_resources or []:
+                dependent = dict(dependent)
+                dependent["showid"] = str(uuid.uuid4())
+                dependent["showparentid"] = instance["showid"]
+                dependent["unavailable"] = False
+                result.append(protectables.Instances(self, dependent))
+
+        if failed:
+            messages.warning(
+                self.request,
+                _('Unable to retrieve the dependent resources of: %s.')
+                % ', '.join(failed))
+        return result
@@ -33,12 +33,8 @@ class ShowCheckpointsAction(tables.Action):
 
 
 class ProtectionProviderFilterAction(tables.FilterAction):
-    def filter(self, table, protectionproviders, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [protectionprovider
-                for protectionprovider in protectionproviders
-                if query in protectionprovider.name.lower()]
+    filter_type = "server"
+    filter_choices = (('name', _("Name ="), True),)
 
 
 class ProtectionProvidersTable(tables.DataTable):
@@ -17,24 +17,28 @@ from django.utils.translation import ugettext_lazy as _
 from horizon import exceptions
 from horizon import tabs
 
-from karbor_dashboard.api import karbor as karborclient
 import simplejson as json
 
 
-class OptionsSchemaTab(tabs.Tab):
-    name = _("Options Schema")
-    slug = "optionsschema"
+class SchemaTab(tabs.Tab):
+    """Show one of the extended info schemas of the provider.
+
+    The provider is fetched once by the view and shared by all the tabs
+    of the group. Only the active tab is rendered with the page, the
+    other ones are loaded through AJAX when they are selected.
+    """
     template_name = "protectionproviders/_schema_contents.html"
+    preload = False
+    schema_name = None
 
     def get_context_data(self, request):
         try:
-            provider_id = self.tab_group.kwargs['provider_id']
-            provider = karborclient.provider_get(request, provider_id)
+            provider = self.tab_group.kwargs['provider']
 
             schema = {}
             if provider is not None:
-                if 'options_schema' in provider.extended_info_schema:
-                    schema = provider.extended_info_schema['options_schema']
+                schema = provider.extended_info_schema.get(self.schema_name,
+                                                           {})
 
             return {"schema_contents": json.dumps(schema, indent=4)}
         except Exception:
@@ -43,47 +47,22 @@ class OptionsSchemaTab(tabs.Tab):
             return None
 
 
-class RestoreSchemaTab(tabs.Tab):
-    name = _("Restore Schema")
-    slug = "restoreschema"
-    template_name = "protectionproviders/_schema_contents.html"
-
-    def get_context_data(self, request):
-        try:
-            provider_id = self.tab_group.kwargs['provider_id']
-            provider = karborclient.provider_get(request, provider_id)
+class OptionsSchemaTab(SchemaTab):
+    name = _("Options Schema")
+    slug = "optionsschema"
+    schema_name = "options_schema"
 
-            schema = {}
-            if provider is not None:
-                if 'restore_schema' in provider.extended_info_schema:
-                    schema = provider.extended_info_schema['restore_schema']
 
-            return {"schema_contents": json.dumps(schema, indent=4)}
-        except Exception:
-            msg = _('Unable to retrieve provider contents.')
-            exceptions.handle(request, msg)
-            return None
+class RestoreSchemaTab(SchemaTab):
+    name = _("Restore Schema")
+    slug = "restoreschema"
+    schema_name = "restore_schema"
 
 
-class SavedInfoSchemaTab(tabs.Tab):
+class SavedInfoSchemaTab(SchemaTab):
     name = _("Saved Info Schema")
     slug = "savedinfoschema"
-    template_name = "protectionproviders/_schema_contents.html"
-
-    def get_context_data(self, request):
-        try:
-            provider_id = self.tab_group.kwargs['provider_id']
-            provider = karborclient.provider_get(request, provider_id)
-            schema = {}
-            if provider is not None:
-                if 'saved_info_schema' in provider.extended_info_schema:
-                    schema = provider.extended_info_schema['saved_info_schema']
-
-            return {"schema_contents": json.dumps(schema, indent=4)}
-        except Exception:
-            msg = _('Unable to retrieve provider contents.')
-            exceptions.handle(request, msg)
-            return None
+    schema_name = "saved_info_schema"
 
 
 class ProviderDetailTabs(tabs.TabGroup):
@@ -20,4 +20,7 @@ urlpatterns = [
     url(r'^$', views.IndexView.as_view(), name='index'),
     url(r'^(?P<provider_id>[^/]+)/detail/$',
         views.DetailView.as_view(), name='detail'),
+    url(r'^schemas/(?P<schema_name>options_schema|restore_schema|'
+        r'saved_info_schema)/$',
+        views.SchemasView.as_view(), name='schemas'),
 ]
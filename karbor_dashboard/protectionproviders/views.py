@@ -12,8 +12,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
+import json
+import logging
+
 from django.core.urlresolvers import reverse
+from django import http
+from django.utils.cache import patch_cache_control
+from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
+from django.views import generic
 
 from horizon import exceptions
 from horizon import tables as horizon_tables
@@ -23,6 +31,9 @@ from horizon.utils import memoized
 from karbor_dashboard.api import karbor as karborclient
 from karbor_dashboard.protectionproviders import tables
 from karbor_dashboard.protectionproviders import tabs
+from karbor_dashboard import views as karbor_views
+
+LOG = logging.getLogger(__name__)
 
 
 class IndexView(horizon_tables.DataTableView):
@@ -46,12 +57,13 @@ class IndexView(horizon_tables.DataTableView):
         else:
             marker = request.GET.get(
                 tables.ProtectionProvidersTable._meta.pagination_param, None)
-            reversed_order = prev_marker is not None
+        reversed_order = prev_marker is not None
         providers = []
         try:
             providers, self._more, self._prev = \
                 karborclient.provider_list_paged(
                     request, None,
+                    search_opts=karbor_views.get_search_opts(self.table),
                     marker=marker,
                     paginate=True,
                     sort_dir='asc',
@@ -92,3 +104,44 @@ class DetailView(horizon_tabs.TabView):
     def get_tabs(self, request, *args, **kwargs):
         provider = self.get_data()
         return self.tab_group_class(request, provider=provider, **kwargs)
+
+
+class SchemasView(generic.View):
+    """Return one extended info schema of the protection providers.
+
+    The result maps provider ids to their ``schema_name`` schema, for
+    every provider or only the one given with ``provider_id``. It is
+    versioned with an ETag so that browsers revalidate it instead of
+    downloading it again.
+    """
+
+    def get(self, request, schema_name):
+        provider_id = request.GET.get('provider_id')
+        try:
+            if provider_id:
+                providers = [karborclient.provider_get(request, provider_id)]
+            else:
+                providers = karborclient.provider_list(request)
+        except Exception:
+            LOG.exception('Unable to retrieve protection provider schemas.')
+            return http.JsonResponse(
+                {"error": force_text(
+                    _('Unable to retrieve protection providers list.'))},
+                status=500)
+
+        schemas = {}
+        for provider in providers:
+            extended_info_schema = getattr(provider, 'extended_info_schema',
+                                           None) or {}
+            schemas[provider.id] = extended_info_schema.get(schema_name) or {}
+        body = json.dumps(schemas, sort_keys=True)
+        etag = '"%s"' % hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+        if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+            response = http.HttpResponseNotModified()
+        else:
+            response = http.HttpResponse(body,
+                                         content_type='application/json')
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -17,6 +17,13 @@ from django.utils.translation import ugettext_lazy as _
 from horizon import tables
 
 
+STATUS_CHOICES = (
+    ("in_progress", None),
+    ("success", True),
+    ("fail", False),
+)
+
+
 class RestoresTable(tables.DataTable):
     id = tables.Column(
         'id',
@@ -26,7 +33,10 @@ class RestoresTable(tables.DataTable):
         verbose_name=_('Protection Plan'))
     status = tables.Column(
         'status',
-        verbose_name=_('Status'))
+        verbose_name=_('Status'),
+        status=True,
+        status_choices=STATUS_CHOICES,
+        classes=("karbor-status",))
     restore_from_checkpoint = tables.Column(
         'checkpoint_id',
         verbose_name=_('Restore From Checkpoint'))
@@ -40,3 +50,4 @@ class RestoresTable(tables.DataTable):
     class Meta(object):
         name = 'restores'
         verbose_name = _('Restores')
+        status_columns = ["status"]
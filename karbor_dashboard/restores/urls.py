@@ -18,4 +18,7 @@ from karbor_dashboard.restores import views
 
 urlpatterns = [
     url(r'^$', views.IndexView.as_view(), name='index'),
+    url(r'^statuses/$', views.StatusesView.as_view(), name='statuses'),
+    url(r'^statuses/stream/$', views.StatusStreamView.as_view(),
+        name='statuses_stream'),
 ]
@@ -18,14 +18,23 @@ from horizon import exceptions
 from horizon import tables as horizon_tables
 
 from karbor_dashboard.api import karbor as karborclient
+from karbor_dashboard.api import utils as api_utils
 from karbor_dashboard.restores import tables
+from karbor_dashboard import views as karbor_views
 
 
-class IndexView(horizon_tables.DataTableView):
+class IndexView(karbor_views.PrefetchPagesMixin,
+                horizon_tables.DataTableView):
     table_class = tables.RestoresTable
+    enriched_attrs = ('name', 'provider_name')
     template_name = 'restores/index.html'
     page_title = _("Restores")
 
+    def get_context_data(self, **kwargs):
+        context = super(IndexView, self).get_context_data(**kwargs)
+        context["status_stream"] = karbor_views.status_stream_enabled()
+        return context
+
     def has_prev_data(self, table):
         return self._prev
 
@@ -45,28 +54,61 @@ class IndexView(horizon_tables.DataTableView):
         reversed_order = prev_marker is not None
         restores = []
         try:
-            restores, self._more, self._prev = \
-                karborclient.restore_list_paged(
-                    self.request,
-                    marker=marker,
-                    paginate=True,
-                    sort_dir='asc',
-                    sort_key='id',
-                    reversed_order=reversed_order)
-
-            for restore in restores:
-                checkpoint = karborclient.checkpoint_get(
-                    self.request,
-                    restore.provider_id,
-                    restore.checkpoint_id)
-                provider = karborclient.provider_get(self.request,
-                                                     restore.provider_id)
-                setattr(restore, "name", checkpoint.protection_plan["name"])
-                setattr(restore, "provider_name", provider.name)
-
+            restores, self._more, self._prev = self.get_page(
+                marker, reversed_order)
         except Exception:
             self._prev = False
             self._more = False
             exceptions.handle(self.request,
                               _('Unable to retrieve restore list.'))
         return restores
+
+    @classmethod
+    def load_page(cls, request, params, marker, reversed_order):
+        restores, has_more_data, has_prev_data = \
+            karborclient.restore_list_paged(
+                request,
+                marker=marker,
+                paginate=True,
+                sort_dir='asc',
+                sort_key='id',
+                reversed_order=reversed_order)
+        cls.set_names(request, restores)
+        return restores, has_more_data, has_prev_data
+
+    @staticmethod
+    def set_names(request, restores):
+        """Attach plan and provider names to the restores.
+
+        Every distinct checkpoint is looked up once, concurrently, and only
+        its summary is kept around.
+        """
+        def get_summary(provider_id, checkpoint_id):
+            return karborclient.checkpoint_get_summary(request, provider_id,
+                                                       checkpoint_id)
+
+        checkpoint_keys = list(set((restore.provider_id,
+                                    restore.checkpoint_id)
+                                   for restore in restores))
+        summaries = dict(zip(checkpoint_keys,
+                             api_utils.concurrent_map(get_summary,
+                                                      checkpoint_keys)))
+        providers = karborclient.provider_get_bulk(
+            request, [restore.provider_id for restore in restores])
+
+        for restore in restores:
+            summary = summaries[(restore.provider_id, restore.checkpoint_id)]
+            setattr(restore, "name", summary.plan_name)
+            setattr(restore, "provider_name",
+                    providers[restore.provider_id].name)
+
+
+class StatusesView(karbor_views.StatusesView):
+    status_choices = tables.STATUS_CHOICES
+
+    def get_statuses(self, request, ids):
+        return karborclient.restore_get_statuses(request, ids)
+
+
+class StatusStreamView(karbor_views.StatusStreamView, StatusesView):
+    kind = 'restores'
@@ -18,18 +18,16 @@ from django.utils.translation import ungettext_lazy
 from horizon import tables
 
 from karbor_dashboard.api import karbor as karborclient
+from karbor_dashboard import tables as karbor_tables
 
 
 class ScheduledOperationFilterAction(tables.FilterAction):
-    def filter(self, table, scheduledoperations, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [scheduledoperation
-                for scheduledoperation in scheduledoperations
-                if query in scheduledoperation.name.lower()]
+    filter_type = "server"
+    filter_choices = (('name', _("Name ="), True),)
 
 
-class DeleteScheduledOperationsAction(tables.DeleteAction):
+class DeleteScheduledOperationsAction(karbor_tables.ConcurrentDeleteMixin,
+                                      tables.DeleteAction):
     @staticmethod
     def action_present(count):
         return ungettext_lazy(u"Delete ScheduledOperation",
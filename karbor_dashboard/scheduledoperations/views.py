@@ -12,13 +12,19 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import logging
+
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon import tables as horizon_tables
 
 from karbor_dashboard.api import karbor as karborclient
+from karbor_dashboard.api import utils as api_utils
 from karbor_dashboard.scheduledoperations import tables
+from karbor_dashboard import views as karbor_views
+
+LOG = logging.getLogger(__name__)
 
 
 class IndexView(horizon_tables.DataTableView):
@@ -48,39 +54,14 @@ class IndexView(horizon_tables.DataTableView):
             scheduledoperations, self._more, self._prev = \
                 karborclient.scheduled_operation_list_paged(
                     self.request,
+                    search_opts=karbor_views.get_search_opts(self.table),
                     marker=marker,
                     paginate=True,
                     sort_dir='asc',
                     sort_key='name',
                     reversed_order=reversed_order)
 
-            for scheduledoperation in scheduledoperations:
-                plan_name, provider_name, trigger_name = ''
-                operation_definition = scheduledoperation.operation_definition
-
-                if "plan_id" in operation_definition.keys():
-                    plan = karborclient.plan_get(
-                        self.request,
-                        operation_definition["plan_id"])
-                    if plan:
-                        plan_name = plan.name
-
-                if "provider_id" in operation_definition.keys():
-                    provider = karborclient.provider_get(
-                        self.request,
-                        operation_definition["provider_id"])
-                    if provider:
-                        provider_name = provider.name
-
-                trigger = karborclient.trigger_get(
-                    self.request,
-                    scheduledoperation.trigger_id)
-                if trigger:
-                    trigger_name = trigger.name
-
-                setattr(scheduledoperation, "plan_name", plan_name)
-                setattr(scheduledoperation, "provider_name", provider_name)
-                setattr(scheduledoperation, "trigger_name", trigger_name)
+            self.set_names(scheduledoperations)
 
         except Exception:
             self._prev = False
@@ -89,3 +70,46 @@ class IndexView(horizon_tables.DataTableView):
                 self.request,
                 _('Unable to retrieve scheduled operation list.'))
         return scheduledoperations
+
+    def set_names(self, scheduledoperations):
+        """Attach plan, provider and trigger names to the operations.
+
+        The distinct plans, providers and triggers referenced by the page
+        are fetched once each, concurrently, and then joined back onto
+        the rows. A failed lookup leaves its name empty.
+        """
+        lookups = set()
+        for scheduledoperation in scheduledoperations:
+            operation_definition = scheduledoperation.operation_definition
+            if "plan_id" in operation_definition:
+                lookups.add((karborclient.plan_get,
+                             operation_definition["plan_id"]))
+            if "provider_id" in operation_definition:
+                lookups.add((karborclient.provider_get,
+                             operation_definition["provider_id"]))
+            lookups.add((karborclient.trigger_get,
+                         scheduledoperation.trigger_id))
+
+        lookups = list(lookups)
+        results = api_utils.concurrent_map(
+            lambda getter, obj_id: getter(self.request, obj_id), lookups,
+            raise_errors=False)
+        names = {}
+        for lookup, result in zip(lookups, results):
+            if isinstance(result, Exception):
+                LOG.warning('Unable to retrieve %s: %s', lookup[1], result)
+                continue
+            names[lookup] = getattr(result, "name", "")
+
+        for scheduledoperation in scheduledoperations:
+            operation_definition = scheduledoperation.operation_definition
+            plan_name = names.get((karborclient.plan_get,
+                                   operation_definition.get("plan_id")), "")
+            provider_name = names.get(
+                (karborclient.provider_get,
+                 operation_definition.get("provider_id")), "")
+            trigger_name = names.get((karborclient.trigger_get,
+                                      scheduledoperation.trigger_id), "")
+            setattr(scheduledoperation, "plan_name", plan_name)
+            setattr(scheduledoperation, "provider_name", provider_name)
+            setattr(scheduledoperation, "trigger_name", trigger_name)
@@ -16,6 +16,6 @@
 horizon.checkpoints_detail = {
   init: function() {
     /* init resource tree */
-    $("#checkpointDetailResource").treetable({ expandable: true });
+    horizon.checkpoints_resources.init("#checkpointDetailResource");
   }
 };
@@ -0,0 +1,90 @@
+/*  Copyright (c) 2016 Huawei, Inc.
+
+    Licensed under the Apache License, Version 2.0 (the "License"); you may
+    not use this file except in compliance with the License. You may obtain
+    a copy of the License at
+
+         http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+    License for the specific language governing permissions and limitations
+    under the License.
+*/
+
+/* Infinite scroll for the checkpoints table.
+   The first page is rendered by the server; the following pages are
+   fetched from the checkpoints list endpoint, rendered by the same table,
+   and appended when the user scrolls near its end. The footer link stays
+   as a fallback and always points past the last appended row. */
+horizon.checkpoints_index = {
+  /* distance to the bottom of the page at which the next page is loaded */
+  THRESHOLD: 200,
+
+  init: function() {
+    var self = this;
+    var more = $("#checkpoints_more");
+    var table = $("table#checkpoints");
+    if(more.length === 0 || table.length === 0) {
+      return;
+    }
+    self.more = more;
+    self.table = table;
+    self.marker = more.data("marker");
+    self.loading = false;
+
+    $(window).on("scroll.checkpoints", function() {
+      self.maybeLoad();
+    });
+    self.maybeLoad();
+  },
+
+  maybeLoad: function() {
+    var self = this;
+    var bottom = $(window).scrollTop() + $(window).height();
+    if(self.loading || !self.marker ||
+       bottom < $(document).height() - self.THRESHOLD) {
+      return;
+    }
+    self.loading = true;
+    self.more.text(gettext("Loading..."));
+    $.ajax({
+      url: self.more.data("url"),
+      data: {marker: self.marker},
+      dataType: "json"
+    }).done(function(data) {
+      self.appendRows(data);
+      self.marker = data.marker;
+      self.more.text("");
+      if(!self.marker) {
+        $(window).off("scroll.checkpoints");
+      }
+    }).fail(function(xhr) {
+      var message = gettext("Unable to retrieve checkpoints list.");
+      if(xhr.responseJSON && xhr.responseJSON.error) {
+        message = xhr.responseJSON.error;
+      }
+      self.marker = null;
+      self.more.text("");
+      horizon.alert("error", message);
+    }).always(function() {
+      self.loading = false;
+    });
+  },
+
+  appendRows: function(data) {
+    var self = this;
+    var tbody = self.table.find("tbody");
+    var next = self.table.find("tfoot a[href^='?marker=']");
+
+    tbody.find("tr.empty").remove();
+    tbody.append(data.rows.join(""));
+    if(data.marker) {
+      next.attr("href", "?marker=" + encodeURIComponent(data.marker));
+    } else {
+      next.remove();
+    }
+    horizon.datatables.update_footer_count(self.table);
+  }
+};
@@ -0,0 +1,171 @@
+/*  Copyright (c) 2016 Huawei, Inc.
+
+    Licensed under the Apache License, Version 2.0 (the "License"); you may
+    not use this file except in compliance with the License. You may obtain
+    a copy of the License at
+
+         http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+    License for the specific language governing permissions and limitations
+    under the License.
+*/
+
+/* Lazily loaded checkpoint resource tree.
+   Only the top level of the graph is rendered by the server; the children of
+   a node are fetched page by page from the resources endpoint the first time
+   the node is expanded. */
+horizon.checkpoints_resources = {
+  MORE_SUFFIX: ":more",
+
+  init: function(selector, options) {
+    var self = this;
+    var table = $(selector);
+    var settings = $.extend({
+      /* builds the extra cells of a resource row */
+      buildCells: function(resource) { return []; },
+      /* called with the rows added to the table */
+      onRowsLoaded: null
+    }, options);
+
+    table.data("resources-settings", settings);
+    table.treetable({
+      expandable: true,
+      onNodeExpand: function() {
+        var node = this;
+        if(node.row.data("ttBranch") === true && node.children.length === 0 &&
+           !node.row.data("loading")) {
+          self.loadChildren(table, node, null);
+        }
+      }
+    });
+
+    /* bind show more event */
+    table.on("click", "tr.resources-more a", function(event) {
+      var row = $(this).closest("tr");
+      var tree = table.data("treetable");
+      var moreNode = tree.tree[row.data("ttId")];
+      var parent = moreNode ? moreNode.parentNode() : null;
+      self.loadChildren(table, parent, row.data("marker"));
+      return event.preventDefault();
+    });
+  },
+
+  /* fetch one page of the children of node (the top level if node is null) */
+  loadChildren: function(table, node, marker) {
+    var self = this;
+    var params = {};
+    if(node != null) {
+      params.parent = node.id;
+      node.row.data("loading", true);
+    }
+    if(marker != null) {
+      params.marker = marker;
+    }
+    $.ajax({
+      url: table.data("resources-url"),
+      data: params,
+      dataType: "json"
+    }).done(function(data) {
+      self.appendRows(table, node, data.resources, data.marker);
+    }).fail(function(xhr) {
+      var message = gettext("Unable to retrieve checkpoint resources.");
+      if(xhr.responseJSON && xhr.responseJSON.error) {
+        message = xhr.responseJSON.error;
+      }
+      horizon.alert("error", message);
+    }).always(function() {
+      if(node != null) {
+        node.row.data("loading", false);
+      }
+    });
+  },
+
+  appendRows: function(table, node, resources, marker) {
+    var settings = table.data("resources-settings");
+    var tree = table.data("treetable");
+    var parentId = node != null ? node.id : null;
+    var moreId = (parentId != null ? parentId : "") + this.MORE_SUFFIX;
+    var anchor = this.removeNode(tree, moreId);
+    var rows = [];
+    var i, row;
+
+    for(i = 0; i < resources.length; i++) {
+      rows.push(this.buildRow(resources[i], parentId, settings));
+    }
+    if(marker) {
+      row = $("<tr>").addClass("resources-more")
+                     .attr("data-tt-id", moreId)
+                     .attr("data-marker", marker);
+      if(parentId != null) {
+        row.attr("data-tt-parent-id", parentId);
+      }
+      row.append($("<td>").attr("colspan", table.find("thead th").length)
+                          .append($("<a href='#'>").text(gettext("Show more"))));
+      rows.push(row[0]);
+    }
+    rows = $(rows);
+
+    if(anchor != null) {
+      rows.insertAfter(anchor);
+      anchor.remove();
+    } else if(node != null) {
+      rows.insertAfter(this.lastDescendantRow(node));
+    } else {
+      table.find("tbody").append(rows);
+    }
+
+    tree.loadRows(rows);
+    rows.each(function() {
+      var child = tree.tree[$(this).data("ttId")];
+      if(node == null || node.expanded()) {
+        child.show();
+      } else {
+        child.row.hide();
+      }
+    });
+    if(settings.onRowsLoaded != null) {
+      settings.onRowsLoaded(rows.filter("[resource-id]"));
+    }
+  },
+
+  buildRow: function(resource, parentId, settings) {
+    var row = $("<tr>").attr("data-tt-id", resource.showid)
+                       .attr("resource-id", resource.id);
+    if(parentId != null) {
+      row.attr("data-tt-parent-id", parentId);
+    }
+    if(resource.has_children) {
+      row.attr("data-tt-branch", "true");
+    }
+    row.append($("<td>").append($("<span class='logoresource'>"))
+                        .append($("<span class='spanresource'>").text(resource.name)));
+    row.append($("<td>").append($("<span class='spanresource'>").text(resource.type)));
+    row.append(settings.buildCells(resource));
+    return row[0];
+  },
+
+  /* the row after which new children of node are inserted */
+  lastDescendantRow: function(node) {
+    while(node.children.length > 0) {
+      node = node.children[node.children.length - 1];
+    }
+    return node.row;
+  },
+
+  /* drop a node from the tree, returning its row so that it can be replaced */
+  removeNode: function(tree, id) {
+    var node = tree.tree[id];
+    var siblings;
+    if(node == null) {
+      return null;
+    }
+    siblings = node.parentId != null ? tree.tree[node.parentId].children : tree.roots;
+    siblings.splice($.inArray(node, siblings), 1);
+    tree.nodes.splice($.inArray(node, tree.nodes), 1);
+    delete tree.tree[id];
+    return node.row;
+  }
+};
@@ -16,8 +16,7 @@
 /* set the choose resources */
 function setRestoredResource() {
   var trResources = $("#checkpointRestoreResource tr[resource-id]");
-  var provider = $.parseJSON($(".provider").val());
-  var parameters = $.Karbor.getResourceDefaultParameters(provider, "restore_schema");
+  var parameters = $.Karbor.getSchemaDefaultParameters(restoreSchemas);
   if(trResources != null) {
     trResources.each(function() {
       var trResource = $(this);
@@ -33,25 +32,44 @@ function setRestoredResource() {
   $(".parameters").val(angular.toJson(parameters));
 }
 
+/* restore schemas of the checkpoint provider, by resource type */
+var restoreSchemas = {};
+
+/* attach the restore schema of the provider to the given resource rows */
+function setRestoreSchema(trResources) {
+  var table = $("#checkpointRestoreResource");
+  $.Karbor.getProviderSchemas(table.data("schemas-url")).done(function(data) {
+    /* the index only holds the provider of the checkpoint */
+    $.each(data, function(providerId, result) {
+      restoreSchemas = result;
+    });
+    for(var r in restoreSchemas) {
+      trResources.find("input[resourcetype='" + r + "']").data("schema", restoreSchemas[r]);
+      trResources.find("input[resourcetype='" + r + "']").data("userdata", null);
+    }
+  });
+}
+
 horizon.checkpoints_restore = {
   /* init create plan dialog */
   init: function(){
    /* init resource tree */
-    $("#checkpointRestoreResource").treetable({ expandable: true });
+    horizon.checkpoints_resources.init("#checkpointRestoreResource", {
+      buildCells: function(resource) {
+        return $("<td>").append(
+          $("<input type='button' class='btn btn-default editparameters'>")
+            .attr("value", gettext("Edit Parameters"))
+            .attr("resourcetype", resource.type));
+      },
+      onRowsLoaded: setRestoreSchema
+    });
 
-    /* init protection provider */
-    (function() {
-      var provider = $.parseJSON($(".provider").val());
-      if(provider != null) {
-        if(provider.extended_info_schema != null) {
-          var result = provider.extended_info_schema['restore_schema'];
-          for(var r in result) {
-            $("#checkpointRestoreResource").find("input[resourcetype='" + r + "']").data("schema", result[r]);
-            $("#checkpointRestoreResource").find("input[resourcetype='" + r + "']").data("userdata", null);
-          }
-        }
-      }
-    })();
+    /* init protection provider, the default parameters of the restore
+       come from the schemas so it cannot be submitted before they are */
+    setRestoreSchema($("#checkpointRestoreResource tr[resource-id]"));
+    $.Karbor.disableUntil(
+      $("input.btn-primary[type='submit']"),
+      $.Karbor.getProviderSchemas($("#checkpointRestoreResource").data("schemas-url")));
 
     /* bind create button event */
     $(".btn-primary").bind("click", function() {
@@ -171,24 +171,40 @@
     }
   }
 
+  /* pending or completed provider schemas requests, by url */
+  var schemaRequests = {};
+
   $.Karbor = {
 
-    /* get the default resources parameters */
-    getResourceDefaultParameters: function(provider, schemaname) {
+    /* fetch the provider schemas index once per url */
+    getProviderSchemas: function(url) {
+      if(!schemaRequests.hasOwnProperty(url)) {
+        schemaRequests[url] = $.ajax({
+          url: url,
+          dataType: "json"
+        }).fail(function(xhr) {
+          delete schemaRequests[url];
+          var message = gettext("Unable to retrieve protection providers list.");
+          if(xhr.responseJSON && xhr.responseJSON.error) {
+            message = xhr.responseJSON.error;
+          }
+          horizon.alert("error", message);
+        }).promise();
+      }
+      return schemaRequests[url];
+    },
+
+    /* get the default parameters of the given resource type schemas */
+    getSchemaDefaultParameters: function(schemas) {
       var parameters = {};
-      if(provider != null) {
-        if(provider.extended_info_schema != null) {
-          var result = provider.extended_info_schema[schemaname];
-          for(var r in result) {
-            parameters[r] = {};
-            var schema = result[r];
-            if(schema!=null) {
-              for(var p in schema.properties) {
-                var property = schema.properties[p];
-                if(property.hasOwnProperty("default")) {
-                  parameters[r][p] = property.default;
-                }
-              }
+      for(var r in schemas) {
+        parameters[r] = {};
+        var schema = schemas[r];
+        if(schema!=null) {
+          for(var p in schema.properties) {
+            var property = schema.properties[p];
+            if(property.hasOwnProperty("default")) {
+              parameters[r][p] = property.default;
             }
           }
         }
@@ -196,6 +212,14 @@
       return parameters;
     },
 
+    /* keep the given buttons disabled until the promise is settled */
+    disableUntil: function(buttons, promise) {
+      buttons.prop("disabled", true);
+      promise.always(function() {
+        buttons.prop("disabled", false);
+      });
+    },
+
     /* check html control required */
     check_required: function(div_id){
       var flag = true;
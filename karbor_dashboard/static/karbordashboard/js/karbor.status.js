@@ -0,0 +1,163 @@
+/*  Copyright (c) 2016 Huawei, Inc.
+
+    Licensed under the Apache License, Version 2.0 (the "License"); you may
+    not use this file except in compliance with the License. You may obtain
+    a copy of the License at
+
+         http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+    License for the specific language governing permissions and limitations
+    under the License.
+*/
+
+/* Live status of the rows of a table.
+   The rows whose status is not final yet are polled together through a
+   statuses endpoint. The delay between two polls grows while the same rows
+   stay pending, and goes back to its initial value when new rows become
+   pending. When the server offers a stream of the status changes, the
+   pending rows are watched through it instead. */
+horizon.karbor_status = {
+  INITIAL_DELAY: 2000,
+  MAX_DELAY: 60000,
+  BACKOFF: 1.5,
+  STATUS_CLASSES: "status_up status_down status_unknown",
+
+  init: function(tableSelector, pollerSelector) {
+    var poller = {
+      table: $(tableSelector),
+      url: $(pollerSelector).data("url"),
+      streamUrl: $(pollerSelector).data("stream-url"),
+      delay: this.INITIAL_DELAY,
+      polled: {},
+      source: null
+    };
+    if(poller.table.length === 0 || !poller.url) {
+      return;
+    }
+    if(poller.streamUrl && window.EventSource) {
+      this.watch(poller);
+    } else {
+      this.schedule(poller);
+    }
+  },
+
+  /* keep a stream open on the pending rows, reopening it when rows are
+     added; fall back to polling if the stream cannot be opened */
+  watch: function(poller) {
+    var self = this;
+    var ids = self.pendingIds(poller);
+    var fresh = false;
+
+    $.each(ids, function(i, id) {
+      fresh = fresh || !poller.polled.hasOwnProperty(id);
+    });
+    if(poller.source != null && (fresh || ids.length === 0)) {
+      poller.source.close();
+      poller.source = null;
+    }
+    if(poller.source == null && ids.length > 0) {
+      poller.polled = {};
+      $.each(ids, function(i, id) {
+        poller.polled[id] = true;
+      });
+      poller.source = new EventSource(
+        poller.streamUrl + "?" + $.param({id: ids}, true));
+      poller.source.onmessage = function(event) {
+        self.update(poller, $.parseJSON(event.data));
+      };
+      poller.source.onerror = function() {
+        if(this.readyState === EventSource.CLOSED) {
+          poller.source = null;
+          poller.streamUrl = null;
+        }
+      };
+    }
+
+    setTimeout(function() {
+      if(poller.streamUrl) {
+        self.watch(poller);
+      } else {
+        poller.polled = {};
+        self.poll(poller);
+      }
+    }, self.INITIAL_DELAY);
+  },
+
+  schedule: function(poller) {
+    var self = this;
+    setTimeout(function() {
+      self.poll(poller);
+    }, poller.delay);
+  },
+
+  pendingIds: function(poller) {
+    var ids = [];
+    poller.table.find("tbody tr.status_unknown[data-object-id]").each(function() {
+      ids.push($(this).attr("data-object-id"));
+    });
+    return ids;
+  },
+
+  poll: function(poller) {
+    var self = this;
+    var ids = self.pendingIds(poller);
+    var fresh = false;
+    var polled = {};
+
+    /* keep watching, pending rows may be appended later */
+    if(ids.length === 0 || document.hidden) {
+      if(ids.length === 0) {
+        poller.delay = self.INITIAL_DELAY;
+      }
+      self.schedule(poller);
+      return;
+    }
+    $.each(ids, function(i, id) {
+      fresh = fresh || !poller.polled.hasOwnProperty(id);
+      polled[id] = true;
+    });
+    poller.polled = polled;
+    poller.delay = fresh ? self.INITIAL_DELAY :
+      Math.min(poller.delay * self.BACKOFF, self.MAX_DELAY);
+
+    $.ajax({
+      url: poller.url,
+      data: {id: ids},
+      traditional: true,
+      dataType: "json"
+    }).done(function(data) {
+      self.update(poller, data);
+    }).always(function() {
+      self.schedule(poller);
+    });
+  },
+
+  update: function(poller, data) {
+    var self = this;
+    var rows = {};
+    poller.table.find("tbody tr[data-object-id]").each(function() {
+      rows[$(this).attr("data-object-id")] = $(this);
+    });
+    $.each(data.statuses, function(id, status) {
+      var row = rows[id];
+      if(row == null) {
+        return;
+      }
+      row.removeClass(self.STATUS_CLASSES).addClass(status[1]);
+      row.find("td.karbor-status").removeClass(self.STATUS_CLASSES)
+                                  .addClass(status[1])
+                                  .text(status[0]);
+    });
+    $.each(data.deleted, function(i, id) {
+      var row = rows[id];
+      if(row != null) {
+        row.fadeOut(function() {
+          row.remove();
+        });
+      }
+    });
+  }
+};
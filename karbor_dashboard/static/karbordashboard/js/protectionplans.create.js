@@ -31,8 +31,8 @@ function setChecked(node, isChecked) {
 function setProtectedResource() {
   var resources = [];
   var cbResources = $(".cbresource:checked");
-  var provider = getProvider($("select[name='provider_id']").val());
-  var parameters = $.Karbor.getResourceDefaultParameters(provider, "options_schema");
+  var schemas = providerSchemas[$("select[name='provider_id']").val()];
+  var parameters = $.Karbor.getSchemaDefaultParameters(schemas);
   if(cbResources != null) {
     cbResources.each(function() {
       var cbResource = $(this);
@@ -53,20 +53,23 @@ function setProtectedResource() {
   $(".parameters").val(angular.toJson(parameters));
 }
 
-/* Get Provider */
-function getProvider(v) {
-  var providers = $(".providers").val();
-  var provider = null;
-  if(providers != null) {
-    var providers_array = $.parseJSON(providers);
-    $(providers_array).each(function() {
-      if(this.id == v) {
-        provider=this;
-        return false;
-      }
-    });
+/* options schemas of the protection providers, by provider id */
+var providerSchemas = {};
+
+/* index the parameters buttons of the resource tree by resource type */
+function indexResourceInputs(table) {
+  var index = {};
+  table.find("input[resourcetype]").each(function() {
+    var type = this.getAttribute("resourcetype");
+    if(!index.hasOwnProperty(type)) {
+      index[type] = [];
+    }
+    index[type].push(this);
+  });
+  for(var type in index) {
+    index[type] = $(index[type]);
   }
-  return provider;
+  return index;
 }
 
 horizon.protectionplans_create = {
@@ -76,21 +79,28 @@ horizon.protectionplans_create = {
     $("#protectionplanCreateResource").treetable({ expandable: true });
 
     /* init protection provider */
+    var table = $("#protectionplanCreateResource");
+    var resourceInputs = indexResourceInputs(table);
+    var allInputs = table.find("input[resourcetype]");
     $("select[name='provider_id']").change(function(evt) {
       var v = $(this).val();
-      provider = getProvider(v);
-      $("#protectionplanCreateResource").find("input[resourcetype]").data("schema", null);
-      $("#protectionplanCreateResource").find("input[resourcetype]").data("userdata", null);
-      if(provider != null) {
-        if(provider.extended_info_schema != null) {
-          //var result = provider.extended_info_schema;
-          var result = provider.extended_info_schema['options_schema'];
-          for(var r in result) {
-            $("#protectionplanCreateResource").find("input[resourcetype='" + r + "']").data("schema", result[r]);
-            $("#protectionplanCreateResource").find("input[resourcetype='" + r + "']").data("userdata", null);
+      allInputs.data("schema", null);
+      allInputs.data("userdata", null);
+      var schemas = $.Karbor.getProviderSchemas(table.data("schemas-url"));
+      schemas.done(function(data) {
+        providerSchemas = data;
+        if(v !== $("select[name='provider_id']").val()) {
+          return;
+        }
+        var result = data[v];
+        for(var r in result) {
+          if(resourceInputs.hasOwnProperty(r)) {
+            resourceInputs[r].data("schema", result[r]);
           }
         }
-      }
+      });
+      /* the default parameters of the plan come from the schemas */
+      $.Karbor.disableUntil($("input.btn-primary[type='submit']"), schemas);
     });
 
     /* trigger protection provider */
@@ -0,0 +1,150 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+
+from django.conf import settings
+from django import shortcuts
+from django.utils.encoding import force_text
+from django.utils.translation import ugettext_lazy as _
+
+from horizon import exceptions
+from horizon import messages
+
+from karbor_dashboard.api import utils as api_utils
+
+LOG = logging.getLogger(__name__)
+
+# Seconds after which a single delete of a batch is given up.
+DEFAULT_DELETE_TIMEOUT = 60
+
+
+def get_status_class(status_choices, status):
+    """Return the CSS class a status column gives to ``status``.
+
+    ``status_choices`` follows the format of Column.status_choices.
+    """
+    status = (status or '').lower()
+    for choice, value in status_choices:
+        if choice == status:
+            if value is True:
+                return "status_up"
+            if value is False:
+                return "status_down"
+            break
+    return "status_unknown"
+
+
+def join_displays(items):
+    """Join the display names of objects for a message."""
+    return u", ".join(force_text(item) for item in items)
+
+
+def handle_error(request, error):
+    """Handle the error of one call of a bulk action.
+
+    Authorization errors are handed to Horizon, which logs the user out.
+    Other failures are only reported in the aggregated message of the
+    action.
+    """
+    if isinstance(error, exceptions.UNAUTHORIZED):
+        try:
+            raise error
+        except Exception:
+            exceptions.handle(request)
+
+
+class ConcurrentDeleteMixin(object):
+    """Delete the objects selected in a table concurrently.
+
+    Mixed into a DeleteAction, it replaces the serial loop of
+    BatchAction.handle(): the deletes are issued at most
+    ``KARBOR_BULK_ACTION_MAX_WORKERS`` at a time, each one fails if it
+    does not complete within ``KARBOR_BULK_ACTION_TIMEOUT`` seconds of
+    its start, and the outcome is reported in the same aggregated
+    messages as Horizon does.
+    """
+
+    def delete_object(self, request, obj_id, datum):
+        """Delete one object, ``datum`` being its row in the table."""
+        self.delete(request, obj_id)
+
+    def handle(self, table, request, obj_ids):
+        data = dict((table.get_object_id(datum), datum)
+                    for datum in table.data)
+        action_not_allowed = []
+        selected = []
+        for datum_id in obj_ids:
+            datum = data.get(datum_id)
+            if datum is None:
+                datum = table.get_object_by_id(datum_id)
+            datum_display = table.get_object_display(datum) or datum_id
+            if not table._filter_action(self, request, datum):
+                action_not_allowed.append(datum_display)
+                LOG.info(u'Permission denied to %(name)s: "%(dis)s"',
+                         {'name': self._get_action_name(past=True).lower(),
+                          'dis': datum_display})
+                continue
+            selected.append((datum_id, datum, datum_display))
+
+        results = api_utils.concurrent_map(
+            self.delete_object,
+            [(request, datum_id, datum) for datum_id, datum, _d in selected],
+            max_workers=api_utils.get_bulk_action_max_workers(),
+            raise_errors=False,
+            timeout=getattr(settings, 'KARBOR_BULK_ACTION_TIMEOUT',
+                            DEFAULT_DELETE_TIMEOUT))
+
+        action_success = []
+        action_failure = []
+        for (datum_id, datum, datum_display), result in zip(selected,
+                                                            results):
+            if isinstance(result, Exception):
+                handle_error(request, result)
+                action_failure.append(datum_display)
+                LOG.warning(u'Action %(action)s failed for "%(dis)s": '
+                            u'%(reason)s',
+                            {'action': self._get_action_name().lower(),
+                             'dis': datum_display, 'reason': result})
+                continue
+            self.update(request, datum)
+            action_success.append(datum_display)
+            self.success_ids.append(datum_id)
+            LOG.info(u'%(action)s: "%(datum_display)s"',
+                     {'action': self._get_action_name(past=True),
+                      'datum_display': datum_display})
+
+        # Begin with success message class, downgrade to info if problems.
+        success_message_level = messages.success
+        if action_not_allowed:
+            msg = _('You are not allowed to %(action)s: %(objs)s')
+            params = {"action":
+                      self._get_action_name(action_not_allowed).lower(),
+                      "objs": join_displays(action_not_allowed)}
+            messages.error(request, msg % params)
+            success_message_level = messages.info
+        if action_failure:
+            msg = _('Unable to %(action)s: %(objs)s')
+            params = {"action": self._get_action_name(action_failure).lower(),
+                      "objs": join_displays(action_failure)}
+            messages.error(request, msg % params)
+            success_message_level = messages.info
+        if action_success:
+            msg = _('%(action)s: %(objs)s')
+            params = {"action":
+                      self._get_action_name(action_success, past=True),
+                      "objs": join_displays(action_success)}
+            success_message_level(request, msg % params)
+
+        return shortcuts.redirect(self.get_success_url(request))
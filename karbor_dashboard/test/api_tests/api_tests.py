@@ -13,11 +13,24 @@
 #    under the License.
 
 
+import collections
+import copy
+from concurrent import futures
+import datetime
+import threading
+import time
+
 from django.conf import settings
 from django.test.utils import override_settings
+from horizon import exceptions
 
 from karbor_dashboard.api import karbor
+from karbor_dashboard.api import utils as api_utils
 from karbor_dashboard.test import helpers as test
+from karborclient import exc as karbor_exc
+from karborclient.v1 import checkpoints
+from karborclient.v1 import providers
+from openstack_dashboard.api import base
 
 
 class karborApiTests(test.APITestCase):
@@ -134,6 +147,41 @@ class karborApiTests(test.APITestCase):
         self.assertFalse(has_more_data)
         self.assertFalse(has_prev_data)
 
+    @override_settings(API_RESULT_PAGE_SIZE=20, KARBOR_PAGE_CACHE_TTL=60)
+    def test_plan_list_paged_cached(self):
+        page_size = getattr(settings, 'API_RESULT_PAGE_SIZE', 20)
+        plan = self.plans.list()
+        karborclient = self.stub_karborclient()
+        karborclient.plans = self.mox.CreateMockAnything()
+        karborclient.plans.list(detailed=False,
+                                search_opts=None,
+                                marker=None,
+                                limit=page_size + 1,
+                                sort_key=None,
+                                sort_dir=None,
+                                sort=None).AndReturn(plan)
+        karborclient.plans.delete(plan[0]["id"])
+        karborclient.plans.list(detailed=False,
+                                search_opts=None,
+                                marker=None,
+                                limit=page_size + 1,
+                                sort_key=None,
+                                sort_dir=None,
+                                sort=None).AndReturn(plan[1:])
+        self.mox.ReplayAll()
+
+        # The second lookup of the page is served from the cache.
+        for i in range(2):
+            ret_val, has_more_data, has_prev_data = karbor.plan_list_paged(
+                self.request, paginate=True)
+            self.assertEqual(len(plan), len(ret_val))
+
+        # Deleting a plan drops the cached pages.
+        karbor.plan_delete(self.request, plan[0]["id"])
+        ret_val, has_more_data, has_prev_data = karbor.plan_list_paged(
+            self.request, paginate=True)
+        self.assertEqual(len(plan) - 1, len(ret_val))
+
     @override_settings(API_RESULT_PAGE_SIZE=1)
     def test_plan_list_paged_more_page_size(self):
         page_size = getattr(settings, 'API_RESULT_PAGE_SIZE', 1)
@@ -452,6 +500,34 @@ class karborApiTests(test.APITestCase):
         self.assertTrue(has_more_data)
         self.assertFalse(has_prev_data)
 
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    def test_operation_log_list_paged_since(self):
+        log = collections.namedtuple('OperationLog',
+                                     ('id', 'actual_start_time'))
+        logs = [log("log_1", "2016-10-18T10:00:00.000000"),
+                log("log_2", "2016-10-17T10:00:00.000000"),
+                log("log_3", "2016-10-16T10:00:00.000000")]
+        karborclient = self.stub_karborclient()
+        karborclient.operation_logs = self.mox.CreateMockAnything()
+        karborclient.operation_logs.list(
+            detailed=False,
+            search_opts=None,
+            marker=None,
+            limit=3,
+            sort_key='actual_start_time',
+            sort_dir='desc',
+            sort=None
+        ).AndReturn(logs)
+        self.mox.ReplayAll()
+        ret_val, has_more_data, has_prev_data = \
+            karbor.operation_log_list_paged(
+                self.request, paginate=True,
+                since=datetime.datetime(2016, 10, 17, 12, 0, 0))
+
+        self.assertEqual(["log_1"], [log.id for log in ret_val])
+        self.assertFalse(has_more_data)
+        self.assertFalse(has_prev_data)
+
     def test_restore_get(self):
         restore = self.restores.first()
         karborclient = self.stub_karborclient()
@@ -462,6 +538,24 @@ class karborApiTests(test.APITestCase):
         ret_val = karbor.restore_get(self.request, restore["id"])
         self.assertEqual(restore["id"], ret_val["id"])
 
+    def test_restore_get_statuses(self):
+        restore_info = self.restores.first()
+        restore = collections.namedtuple('Restore', ('id', 'status'))(
+            restore_info["id"], restore_info["status"])
+        karborclient = self.stub_karborclient()
+        karborclient.restores = self.mox.CreateMockAnything()
+        karborclient.restores.get(restore.id).AndReturn(restore)
+        karborclient.restores.get("restore_2").AndRaise(
+            karbor_exc.HTTPNotFound())
+        karborclient.restores.get("restore_3").AndRaise(
+            karbor_exc.HTTPInternalServerError())
+        self.mox.ReplayAll()
+
+        statuses = karbor.restore_get_statuses(
+            self.request, [restore.id, "restore_2", "restore_3"])
+        self.assertEqual({restore.id: restore.status,
+                          "restore_2": None}, statuses)
+
     def test_protectable_list(self):
         protectables_list = self.protectables_list.list()
         karborclient = self.stub_karborclient()
@@ -499,6 +593,45 @@ class karborApiTests(test.APITestCase):
                                                   )
         self.assertEqual(protectable["name"], ret_val["name"])
 
+    def test_protectable_get_instances_bulk(self):
+        protectables = self.protectables_ins.list()[:2]
+        keys = [(p["type"], p["id"]) for p in protectables]
+        karborclient = self.stub_karborclient()
+        karborclient.protectables = self.mox.CreateMockAnything()
+        for protectable in protectables:
+            karborclient.protectables.get_instance(
+                protectable["type"],
+                protectable["id"]).InAnyOrder().AndReturn(protectable)
+        self.mox.ReplayAll()
+
+        ret_val = karbor.protectable_get_instances_bulk(
+            self.request, keys + keys[:1])
+        self.assertEqual(2, len(ret_val))
+        self.assertEqual(protectables[1]["name"], ret_val[keys[1]]["name"])
+
+        # A second lookup within the same request is served from memory.
+        ret_val = karbor.protectable_get_instances_bulk(self.request,
+                                                        keys[:1])
+        self.assertEqual(protectables[0]["name"], ret_val[keys[0]]["name"])
+
+    def test_protectable_get_instances_bulk_errors(self):
+        protectables = self.protectables_ins.list()[:2]
+        keys = [(p["type"], p["id"]) for p in protectables]
+        karborclient = self.stub_karborclient()
+        karborclient.protectables = self.mox.CreateMockAnything()
+        karborclient.protectables.get_instance(
+            protectables[0]["type"],
+            protectables[0]["id"]).InAnyOrder().AndReturn(protectables[0])
+        karborclient.protectables.get_instance(
+            protectables[1]["type"],
+            protectables[1]["id"]).InAnyOrder().AndRaise(Exception())
+        self.mox.ReplayAll()
+
+        ret_val = karbor.protectable_get_instances_bulk(
+            self.request, keys, raise_errors=False)
+        self.assertEqual(protectables[0]["name"], ret_val[keys[0]]["name"])
+        self.assertIsInstance(ret_val[keys[1]], Exception)
+
     def test_protectable_list_instances(self):
         protectable = self.protectables_ins.list()
         karborclient = self.stub_karborclient()
@@ -726,6 +859,75 @@ class karborApiTests(test.APITestCase):
                                            provider_id="fake_provider_id")
         self.assertEqual(provider["name"], ret_provider["name"])
 
+    def test_provider_get_cached(self):
+        provider = providers.Provider(None, self.providers.first(),
+                                      loaded=True)
+        karborclient = self.stub_karborclient()
+        karborclient.providers = self.mox.CreateMockAnything()
+        karborclient.providers.get(provider.id).AndReturn(provider)
+        karborclient.providers.get(provider.id).AndReturn(provider)
+        self.mox.ReplayAll()
+
+        hits = karbor.PROVIDER_CACHE.hits
+        for i in range(2):
+            ret_provider = karbor.provider_get(self.request, provider.id)
+            self.assertEqual(provider.name, ret_provider.name)
+            self.assertEqual(provider.options_schema,
+                             ret_provider.options_schema)
+        self.assertEqual(hits + 1, karbor.PROVIDER_CACHE.hits)
+
+        karbor.provider_cache_invalidate(self.request, provider.id)
+        karbor.provider_get(self.request, provider.id)
+
+    @override_settings(KARBOR_PROVIDER_CACHE_MAX_ENTRIES=1)
+    def test_provider_cache_eviction(self):
+        karbor.PROVIDER_CACHE.set("fake_project", "first", ["first"])
+        karbor.PROVIDER_CACHE.set("fake_project", "second", ["second"])
+        self.assertIsNone(karbor.PROVIDER_CACHE.get("fake_project", "first"))
+        self.assertEqual(["second"],
+                         karbor.PROVIDER_CACHE.get("fake_project", "second"))
+
+    @override_settings(KARBOR_PROVIDER_CACHE_MAX_ENTRIES=2)
+    def test_provider_cache_read_entry_survives_eviction(self):
+        cache = karbor.PROVIDER_CACHE
+        cache.set("fake_project", "first", ["first"])
+        cache.set("fake_project", "second", ["second"])
+        self.assertEqual(["first"], cache.get("fake_project", "first"))
+
+        # The least recently used entry is evicted, not the oldest one.
+        cache.set("fake_project", "third", ["third"])
+        self.assertEqual(["first"], cache.get("fake_project", "first"))
+        self.assertIsNone(cache.get("fake_project", "second"))
+
+    @override_settings(KARBOR_PROVIDER_CACHE_MAX_ENTRIES=4)
+    def test_provider_cache_recent_hit_keeps_index(self):
+        cache = karbor.PROVIDER_CACHE
+        for key in ("first", "second", "third", "fourth"):
+            cache.set("fake_project", key, [key])
+        index = api_utils.get_cache().get(cache._index_key("fake_project"))
+        self.assertEqual(["fourth"], cache.get("fake_project", "fourth"))
+        self.assertEqual(index, api_utils.get_cache().get(
+            cache._index_key("fake_project")))
+
+    def test_provider_get_bulk(self):
+        provider = self.providers.first()
+        karborclient = self.stub_karborclient()
+        karborclient.providers = self.mox.CreateMockAnything()
+        karborclient.providers.get(provider["id"]).AndReturn(provider)
+        self.mox.ReplayAll()
+
+        ret_providers = karbor.provider_get_bulk(
+            self.request, [provider["id"], provider["id"]])
+        self.assertEqual(1, len(ret_providers))
+        self.assertEqual(provider["name"],
+                         ret_providers[provider["id"]]["name"])
+
+        # A second lookup within the same request is served from memory.
+        ret_providers = karbor.provider_get_bulk(self.request,
+                                                 [provider["id"]])
+        self.assertEqual(provider["name"],
+                         ret_providers[provider["id"]]["name"])
+
     def test_checkpoint_create(self):
         checkpoint = self.checkpoints.first()
         karborclient = self.stub_karborclient()
@@ -864,6 +1066,54 @@ class karborApiTests(test.APITestCase):
             checkpoint_id="fake_checkpoint_id")
         self.assertEqual(checkpoint["id"], ret_checkpoint["id"])
 
+    def test_checkpoint_get_statuses(self):
+        karborclient = self.stub_karborclient()
+        karborclient.checkpoints = self.mox.CreateMockAnything()
+        for checkpoint_id, result in (
+                ("checkpoint_1", {"status": "available"}),
+                ("checkpoint_2", {"status": "deleted"}),
+                ("checkpoint_3", karbor_exc.HTTPNotFound()),
+                ("checkpoint_4", karbor_exc.HTTPInternalServerError())):
+            call = karborclient.checkpoints.get("fake_provider_id",
+                                                checkpoint_id)
+            if isinstance(result, Exception):
+                call.AndRaise(result)
+            else:
+                call.AndReturn(checkpoints.Checkpoint(
+                    None, dict(result, id=checkpoint_id), loaded=True))
+        self.mox.ReplayAll()
+
+        # Missing and deleted checkpoints map to None, failures are left out.
+        statuses = karbor.checkpoint_get_statuses(
+            self.request, "fake_provider_id",
+            ["checkpoint_1", "checkpoint_2", "checkpoint_3", "checkpoint_4"])
+        self.assertEqual({"checkpoint_1": "available",
+                          "checkpoint_2": None,
+                          "checkpoint_3": None}, statuses)
+        # Only the summary is kept, and it serves later row labels.
+        summary = karbor.checkpoint_get_summary(
+            self.request, "fake_provider_id", "checkpoint_1")
+        self.assertEqual(karbor.CheckpointSummary(None, "available"),
+                         summary)
+
+    def test_checkpoint_get_summary(self):
+        checkpoint_info = self.checkpoints.list()[1][0]
+        checkpoint_info["protection_plan"] = checkpoint_info["plan"]
+        checkpoint = checkpoints.Checkpoint(None, checkpoint_info,
+                                            loaded=True)
+        karborclient = self.stub_karborclient()
+        karborclient.checkpoints = self.mox.CreateMockAnything()
+        karborclient.checkpoints.get(checkpoint.provider_id,
+                                     checkpoint.id).AndReturn(checkpoint)
+        self.mox.ReplayAll()
+
+        for i in range(2):
+            summary = karbor.checkpoint_get_summary(self.request,
+                                                    checkpoint.provider_id,
+                                                    checkpoint.id)
+            self.assertEqual("My 3 tier application", summary.plan_name)
+            self.assertEqual("committed", summary.status)
+
     def test_trigger_create(self):
         trigger = self.triggers.first()
         karborclient = self.stub_karborclient()
@@ -997,3 +1247,135 @@ class karborApiTests(test.APITestCase):
         ret_trigger = karbor.trigger_get(self.request,
                                          trigger_id="fake_trigger_id")
         self.assertEqual(trigger["id"], ret_trigger["id"])
+
+    def test_concurrent_map(self):
+        ret_val = api_utils.concurrent_map(lambda x, y: x * y,
+                                           [(i, 2) for i in range(20)],
+                                           max_workers=4)
+        self.assertEqual([i * 2 for i in range(20)], ret_val)
+
+    def test_concurrent_map_errors(self):
+        def invert(x):
+            return 1.0 / x
+
+        self.assertRaises(ZeroDivisionError, api_utils.concurrent_map,
+                          invert, [(1,), (0,)], max_workers=2)
+        ret_val = api_utils.concurrent_map(invert, [(1,), (0,), (2,)],
+                                           max_workers=2, raise_errors=False)
+        self.assertEqual(1.0, ret_val[0])
+        self.assertIsInstance(ret_val[1], ZeroDivisionError)
+        self.assertEqual(0.5, ret_val[2])
+
+    def test_concurrent_map_timeout(self):
+        event = threading.Event()
+        started = []
+
+        def wait(x):
+            started.append(x)
+            if x == 0:
+                event.wait(5)
+            return x
+
+        try:
+            ret_val = api_utils.concurrent_map(wait, [(0,), (1,), (2,)],
+                                               max_workers=2,
+                                               raise_errors=False,
+                                               timeout=0.1)
+        finally:
+            event.set()
+        # Only the call running past its own timeout fails, the others
+        # run on the remaining worker.
+        self.assertIsInstance(ret_val[0], futures.TimeoutError)
+        self.assertEqual([1, 2], ret_val[1:])
+        self.assertEqual([0, 1, 2], sorted(started))
+
+    def test_concurrent_map_timeout_per_call(self):
+        def wait(x):
+            time.sleep(0.07)
+            return x
+
+        # Every call takes just under the timeout, the queued ones are
+        # not failed for waiting for a worker.
+        ret_val = api_utils.concurrent_map(wait, [(i,) for i in range(6)],
+                                           max_workers=2, timeout=0.1)
+        self.assertEqual(list(range(6)), ret_val)
+
+    def test_concurrent_map_timeout_workers_stuck(self):
+        event = threading.Event()
+        started = []
+
+        def wait(x):
+            started.append(x)
+            event.wait(5)
+            return x
+
+        try:
+            ret_val = api_utils.concurrent_map(wait, [(0,), (1,)],
+                                               max_workers=1,
+                                               raise_errors=False,
+                                               timeout=0.1)
+        finally:
+            event.set()
+        # The queued call cannot start once the only worker is stuck.
+        self.assertIsInstance(ret_val[0], futures.TimeoutError)
+        self.assertIsInstance(ret_val[1], futures.TimeoutError)
+        self.assertEqual([0], started)
+
+    @override_settings(KARBOR_CLIENT_POOL_SIZE=2)
+    def test_client_pool(self):
+        pool = api_utils.ClientPool()
+        now = datetime.datetime.utcnow()
+        expires = now + datetime.timedelta(hours=1)
+
+        first = pool.get('token_1', object, expires=expires)
+        self.assertIs(first, pool.get('token_1', object, expires=expires))
+        pool.get('token_2', object, expires=expires)
+        pool.get('token_3', object, expires=expires)
+        self.assertEqual(2, len(pool))
+        self.assertIsNot(first, pool.get('token_1', object, expires=expires))
+
+        expired = pool.get('token_4', object, expires=now)
+        self.assertIsNot(expired, pool.get('token_4', object, expires=now))
+
+    def test_get_karbor_endpoint_cached(self):
+        self.mox.StubOutWithMock(base, 'url_for')
+        base.url_for(self.request, "data-protect").AndRaise(
+            exceptions.ServiceCatalogException("data-protect"))
+        self.mox.ReplayAll()
+
+        # The fallback is resolved once, later lookups hit the cache.
+        for i in range(2):
+            self.assertEqual(karbor.DEFAULT_ENDPOINT,
+                             karbor.get_karbor_endpoint(self.request))
+        self.assertTrue(karbor.resolve_karbor_endpoint(self.request).fallback)
+        region = getattr(self.request.user, 'services_region', None) or ''
+        self.assertEqual(
+            [karbor.DEFAULT_ENDPOINT, True],
+            api_utils.get_cache().get(karbor.ENDPOINT_CACHE._key(
+                region, karbor._catalog_fingerprint(self.request))))
+
+    def test_get_karbor_endpoint_cached_across_tokens(self):
+        self.mox.StubOutWithMock(base, 'url_for')
+        base.url_for(self.request, "data-protect").AndReturn(
+            'http://karbor:8799')
+        self.mox.ReplayAll()
+
+        self.assertEqual('http://karbor:8799',
+                         karbor.get_karbor_endpoint(self.request))
+        # A new token of the same catalog resolves from the cache.
+        request = copy.copy(self.request)
+        request.user = copy.copy(self.request.user)
+        request.user.token = copy.copy(self.request.user.token)
+        request.user.token.id = 'another-token'
+        self.assertEqual('http://karbor:8799',
+                         karbor.get_karbor_endpoint(request))
+
+    def test_update_pagination_reversed(self):
+        entity = collections.namedtuple('Entity', ('id', 'size'))
+        # The server sorted the page descending for a "Prev" click.
+        entities = [entity(i, i) for i in (5, 4, 3)]
+        ret_val, has_more_data, has_prev_data = karbor.update_pagination(
+            entities, 2, 6, 'desc', 'size', True)
+        self.assertEqual([4, 5], [e.id for e in ret_val])
+        self.assertTrue(has_more_data)
+        self.assertTrue(has_prev_data)
@@ -0,0 +1,112 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+from horizon import exceptions
+
+from karbor_dashboard.api import watchers
+from openstack_dashboard.test import helpers as test
+
+
+class FakeKarbor(object):
+    """Checkpoint statuses served in process, recording every poll."""
+
+    def __init__(self, statuses):
+        self.statuses = dict(statuses)
+        self.polls = []
+        self._lock = threading.Lock()
+
+    def get_statuses(self, ids):
+        with self._lock:
+            self.polls.append(list(ids))
+            return dict((obj_id, self.statuses.get(obj_id))
+                        for obj_id in ids)
+
+
+class FakeUnauthorized(Exception):
+    pass
+
+
+class WatcherRegistryTests(test.TestCase):
+    KEY = ('project', 'checkpoints', 'provider')
+
+    def wait_until(self, predicate, timeout=5):
+        deadline = time.time() + timeout
+        while not predicate():
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.01)
+
+    def test_subscriptions_share_one_watcher(self):
+        karbor = FakeKarbor({"cp_1": "protecting", "cp_2": "protecting"})
+        registry = watchers.WatcherRegistry(interval=0.01)
+
+        first = registry.subscribe(self.KEY, karbor.get_statuses, ["cp_1"])
+        second = registry.subscribe(self.KEY, karbor.get_statuses,
+                                    ["cp_1", "cp_2"])
+        try:
+            self.assertEqual(1, len(registry))
+            self.assertEqual({"cp_1": "protecting"}, first.get(5))
+            self.wait_until(lambda: ["cp_1", "cp_2"] in karbor.polls)
+
+            karbor.statuses["cp_1"] = "available"
+            del karbor.statuses["cp_2"]
+            self.assertEqual({"cp_1": "available"}, first.get(5))
+            received = {}
+
+            def changed():
+                received.update(second.get(0.1) or {})
+                return (received.get("cp_1") == "available" and
+                        "cp_2" in received and received["cp_2"] is None)
+
+            self.wait_until(changed)
+            # The same polls serve both subscriptions.
+            self.assertTrue(all(ids in (["cp_1"], ["cp_1", "cp_2"])
+                                for ids in karbor.polls))
+        finally:
+            first.close()
+            second.close()
+        self.wait_until(lambda: len(registry) == 0)
+
+    def test_poll_falls_back_on_unauthorized(self):
+        self.mox.stubs.Set(exceptions, 'UNAUTHORIZED', (FakeUnauthorized,))
+        karbor = FakeKarbor({"cp_1": "protecting"})
+        expired = []
+
+        def expired_fetch(ids):
+            expired.append(list(ids))
+            raise FakeUnauthorized()
+
+        watcher = watchers.StatusWatcher(watchers.WatcherRegistry(),
+                                         self.KEY, 1)
+        first = watcher.subscribe(["cp_1"], karbor.get_statuses)
+        second = watcher.subscribe(["cp_1"], expired_fetch)
+
+        # The latest subscriber is rejected, the first one is used.
+        watcher.poll()
+        self.assertEqual([["cp_1"]], expired)
+        self.assertEqual([["cp_1"]], karbor.polls)
+        self.assertEqual({"cp_1": "protecting"}, second.get(0))
+
+        # Rejected credentials are not tried again.
+        watcher.poll()
+        self.assertEqual([["cp_1"]], expired)
+        self.assertEqual(2, len(karbor.polls))
+
+        # Closed subscriptions are not polled with.
+        first.close()
+        watcher.poll()
+        self.assertEqual(2, len(karbor.polls))
+        second.close()
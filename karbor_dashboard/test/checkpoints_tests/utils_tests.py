@@ -0,0 +1,130 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import json
+
+from django.test.utils import override_settings
+
+from karbor_dashboard.checkpoints import utils
+from openstack_dashboard.test import helpers as test
+
+
+def make_chain_graph(length):
+    """Return a serialized graph of a single dependency chain."""
+    nodes = dict((str(i), ["OS::Cinder::Volume", "volume_%d" % i,
+                           "Volume %d" % i])
+                 for i in range(length))
+    adjacency = [[str(i), [str(i + 1)]]
+                 for i in reversed(range(length - 1))]
+    return json.dumps([nodes, adjacency])
+
+
+class CheckpointUtilsTests(test.TestCase):
+    def setUp(self):
+        super(CheckpointUtilsTests, self).setUp()
+        utils.RESOURCE_TREE_CACHE.clear()
+
+    def test_build_resource_tree(self):
+        graph = json.dumps([
+            {"0": ["OS::Nova::Server", "server_1", "Server 1"],
+             "1": ["OS::Cinder::Volume", "volume_1", "Volume 1"],
+             "2": ["OS::Glance::Image", "image_1", "Image 1"]},
+            [["0", ["1", "2"]]]
+        ])
+
+        tree = utils.build_resource_tree(graph)
+
+        self.assertEqual(("0",), tree.roots)
+        self.assertEqual({"0": ("1", "2")},
+                         dict((sid, tuple(child_sids))
+                              for sid, child_sids in tree.children.items()))
+        self.assertEqual("OS::Cinder::Volume", tree.nodes["1"][0])
+        self.assertEqual("Volume 1", tree.nodes["1"][2])
+
+    def test_build_resource_tree_deep_chain(self):
+        tree = utils.build_resource_tree(make_chain_graph(50000))
+
+        self.assertEqual(50000, len(tree.nodes))
+        self.assertEqual(("0",), tree.roots)
+        rows, marker = utils.get_tree_page(tree, parent_sid="49998")
+        self.assertEqual(["volume_49999"], [row.id for row in rows])
+        self.assertIsNone(marker)
+
+    def test_get_resource_page(self):
+        checkpoint = collections.namedtuple('Checkpoint', 'resource_graph')
+        graph = json.dumps([
+            {"0": ["OS::Nova::Server", "server_1", "Server 1"],
+             "1": ["OS::Cinder::Volume", "volume_1", "Volume 1"],
+             "2": ["OS::Glance::Image", "image_1", "Image 1"],
+             "3": ["OS::Nova::Server", "server_2", "Server 2"]},
+            [["0", ["1", "2"]]]
+        ])
+        self.mox.StubOutWithMock(utils, 'get_checkpoint')
+        utils.get_checkpoint(self.request, 'provider_1', 'checkpoint_1') \
+            .AndReturn(checkpoint(graph))
+        self.mox.ReplayAll()
+
+        rows, marker = utils.get_resource_page(
+            self.request, 'provider_1', 'checkpoint_1', limit=1)
+        self.assertEqual(["server_1"], [row.id for row in rows])
+        self.assertTrue(rows[0].has_children)
+        self.assertEqual("0", marker)
+
+        rows, marker = utils.get_resource_page(
+            self.request, 'provider_1', 'checkpoint_1', marker=marker,
+            limit=1)
+        self.assertEqual(["server_2"], [row.id for row in rows])
+        self.assertFalse(rows[0].has_children)
+        self.assertIsNone(marker)
+
+        rows, marker = utils.get_resource_page(
+            self.request, 'provider_1', 'checkpoint_1', parent_sid="0")
+        self.assertEqual(["volume_1", "image_1"], [row.id for row in rows])
+        self.assertEqual(["0", "0"], [row.showparentid for row in rows])
+        self.assertIsNone(marker)
+
+        self.assertEqual(
+            utils.build_resource_tree(graph),
+            utils.RESOURCE_TREE_CACHE.get((self.request.user.tenant_id,
+                                           'provider_1', 'checkpoint_1')))
+
+    @override_settings(KARBOR_RESOURCE_TREE_CACHE_MAX_NODES=5)
+    def test_resource_tree_cache_size(self):
+        cache = utils.ResourceTreeCache()
+        small = utils.build_resource_tree(make_chain_graph(3))
+        cache.set('small', small)
+
+        # A tree over the limit is not cached and does not evict others.
+        cache.set('large', utils.build_resource_tree(make_chain_graph(6)))
+        self.assertIsNone(cache.get('large'))
+        self.assertIs(small, cache.get('small'))
+
+        # Least recently used trees make room for new ones.
+        cache.set('other', utils.build_resource_tree(make_chain_graph(2)))
+        self.assertIs(small, cache.get('small'))
+        cache.set('third', utils.build_resource_tree(make_chain_graph(2)))
+        self.assertIsNone(cache.get('other'))
+        self.assertIs(small, cache.get('small'))
+        self.assertEqual(2, len(cache))
+
+    def test_get_tree_page_invalid(self):
+        tree = utils.build_resource_tree(make_chain_graph(3))
+
+        self.assertRaises(ValueError, utils.get_tree_page, tree,
+                          parent_sid="9")
+        self.assertRaises(ValueError, utils.get_tree_page, tree,
+                          marker="1")
+        self.assertRaises(ValueError, utils.get_tree_page, tree,
+                          parent_sid="0", marker="2")
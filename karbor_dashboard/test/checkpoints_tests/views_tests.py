@@ -0,0 +1,70 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from django.http import QueryDict
+
+from karbor_dashboard.api import karbor
+from karbor_dashboard.checkpoints import views
+from karborclient.v1 import checkpoints
+from karborclient.v1 import providers
+from openstack_dashboard.test import helpers as test
+
+
+class ListViewTests(test.TestCase):
+    def setUp(self):
+        super(ListViewTests, self).setUp()
+        self.calls = []
+        provider = providers.Provider(None, {"id": "fake_provider_id",
+                                             "name": "fake_provider"},
+                                      loaded=True)
+
+        def checkpoint_list_paged(request, **kwargs):
+            self.calls.append(kwargs)
+            return [checkpoints.Checkpoint(None, {
+                "id": "checkpoint_2",
+                "status": "available",
+                "protection_plan": {"id": "fake_plan_id1",
+                                    "name": "fake_name_1",
+                                    "provider_id": "fake_provider_id"},
+            }, loaded=True)], True, True
+
+        def provider_get_bulk(request, provider_ids, providers=None):
+            return dict((provider_id, provider)
+                        for provider_id in provider_ids)
+
+        self.mox.stubs.Set(karbor, 'checkpoint_list_paged',
+                           checkpoint_list_paged)
+        self.mox.stubs.Set(karbor, 'provider_list',
+                           lambda request: [provider])
+        self.mox.stubs.Set(karbor, 'provider_get_bulk', provider_get_bulk)
+
+    def test_list_renders_table_rows(self):
+        self.request.GET = QueryDict('marker=checkpoint_1')
+
+        response = views.ListView.as_view()(self.request,
+                                             provider_id="fake_provider_id")
+
+        self.assertEqual(200, response.status_code)
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEqual("checkpoint_2", data["marker"])
+        self.assertEqual("checkpoint_1", self.calls[0]['marker'])
+        self.assertEqual(1, len(data["rows"]))
+        # Appended rows can be selected and deleted like the first page.
+        row = data["rows"][0]
+        self.assertIn('id="checkpoints__row__checkpoint_2"', row)
+        self.assertIn('type="checkbox"', row)
+        self.assertIn('checkpoints__delete__checkpoint_2', row)
+        self.assertIn('fake_provider', row)
@@ -13,6 +13,7 @@
 #    under the License.
 
 from karbor_dashboard import api
+from karbor_dashboard.api import utils as api_utils
 from karbor_dashboard.test import test_data
 from karborclient.v1 import client as karbor_client
 from openstack_dashboard.test import helpers
@@ -23,6 +24,7 @@ class APITestCase(helpers.APITestCase):
 
     def setUp(self):
         super(APITestCase, self).setUp()
+        api_utils.get_cache().clear()
         self._original_karborclient = api.karbor.karborclient
         api.karbor.karborclient = lambda request: self.stub_karborclient()
 
@@ -0,0 +1,73 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import datetime
+
+from django.test.utils import override_settings
+
+from karbor_dashboard.api import karbor
+from karbor_dashboard.operationlogs import tables
+from karbor_dashboard.operationlogs import views
+from openstack_dashboard.test import helpers as test
+
+OperationLog = collections.namedtuple('OperationLog', ('id',))
+
+
+class IndexViewTests(test.TestCase):
+    def setUp(self):
+        super(IndexViewTests, self).setUp()
+        self.calls = []
+
+        def operation_log_list_paged(request, **kwargs):
+            self.calls.append(kwargs)
+            return [OperationLog("log_2"), OperationLog("log_3")], True, True
+
+        self.mox.stubs.Set(karbor, 'operation_log_list_paged',
+                           operation_log_list_paged)
+
+    def get_data(self, **params):
+        view = views.IndexView()
+        view.request = self.factory.get('/', params)
+        logs = view.get_data()
+        return view, logs
+
+    @override_settings(KARBOR_OPERATION_LOG_WINDOW=2)
+    def test_index_next_page(self):
+        meta = tables.OperationLogsTable._meta
+        view, logs = self.get_data(**{meta.pagination_param: "log_1"})
+
+        self.assertEqual(["log_2", "log_3"], [log.id for log in logs])
+        self.assertTrue(view.has_more_data(None))
+        self.assertTrue(view.has_prev_data(None))
+        kwargs = self.calls[0]
+        self.assertEqual("log_1", kwargs['marker'])
+        self.assertFalse(kwargs['reversed_order'])
+        # Only the logs of the last KARBOR_OPERATION_LOG_WINDOW hours.
+        window = datetime.datetime.utcnow() - kwargs['since']
+        self.assertTrue(datetime.timedelta(hours=2) <= window <
+                        datetime.timedelta(hours=2, minutes=1))
+
+    def test_index_prev_page(self):
+        meta = tables.OperationLogsTable._meta
+        view, logs = self.get_data(**{meta.prev_pagination_param: "log_4",
+                                      meta.pagination_param: "log_1"})
+
+        kwargs = self.calls[0]
+        self.assertEqual("log_4", kwargs['marker'])
+        self.assertTrue(kwargs['reversed_order'])
+        window = datetime.datetime.utcnow() - kwargs['since']
+        self.assertTrue(datetime.timedelta(hours=views.DEFAULT_WINDOW) <=
+                        window < datetime.timedelta(hours=views.DEFAULT_WINDOW,
+                                                    minutes=1))
@@ -0,0 +1,88 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from horizon import messages
+
+from karbor_dashboard.api import karbor
+from karbor_dashboard.protectionplans import tables
+from karbor_dashboard import tables as karbor_tables
+from karbor_dashboard.test import helpers as test
+from karborclient.v1 import plans
+
+
+class ProtectNowTests(test.APITestCase):
+    def test_protect_now_bulk(self):
+        data = [plans.Plan(None, plan, loaded=True)
+                for plan in self.plans.list()]
+        table = tables.ProtectionPlansTable(self.request, data=data)
+        action = table.base_actions["protectnow"]
+        created = []
+        reported = []
+        handled = []
+        error = Exception("protection failed")
+
+        def checkpoint_create(request, provider_id, plan_id):
+            if plan_id == "fake_plan_id2":
+                raise error
+            created.append((provider_id, plan_id))
+
+        self.mox.stubs.Set(karbor, 'checkpoint_create', checkpoint_create)
+        self.mox.stubs.Set(karbor_tables, 'handle_error',
+                           lambda request, e: handled.append(e))
+        self.mox.stubs.Set(messages, 'success',
+                           lambda request, msg: reported.append(msg))
+        self.mox.stubs.Set(messages, 'error',
+                           lambda request, msg: reported.append(msg))
+
+        action.handle(table, self.request,
+                      ["fake_plan_id1", "fake_plan_id2", "fake_plan_id3"])
+
+        self.assertEqual([("fake_provider_id1", "fake_plan_id1"),
+                          ("fake_provider_id3", "fake_plan_id3")],
+                         sorted(created))
+        # Failures go through Horizon, which logs out unauthorized users.
+        self.assertEqual([error], handled)
+        self.assertEqual(2, len(reported))
+        self.assertIn("fake_name_1", reported[0])
+        self.assertIn("fake_name_new", reported[1])
+
+    def test_delete_plans_concurrently(self):
+        data = [plans.Plan(None, plan, loaded=True)
+                for plan in self.plans.list()]
+        table = tables.ProtectionPlansTable(self.request, data=data)
+        action = table.base_actions["delete"]
+        deleted = []
+        reported = []
+
+        def plan_delete(request, plan_id):
+            if plan_id == "fake_plan_id2":
+                raise Exception("deletion failed")
+            deleted.append(plan_id)
+
+        self.mox.stubs.Set(karbor, 'plan_delete', plan_delete)
+        for level in ('success', 'info', 'error'):
+            self.mox.stubs.Set(
+                messages, level,
+                lambda request, msg, level=level: reported.append((level,
+                                                                   msg)))
+
+        action.handle(table, self.request,
+                      ["fake_plan_id1", "fake_plan_id2", "fake_plan_id3"])
+
+        self.assertEqual(["fake_plan_id1", "fake_plan_id3"], sorted(deleted))
+        self.assertEqual(["fake_plan_id1", "fake_plan_id3"],
+                         sorted(action.success_ids))
+        self.assertEqual(["error", "info"],
+                         [level for level, msg in reported])
+        self.assertIn("fake_name_new", reported[0][1])
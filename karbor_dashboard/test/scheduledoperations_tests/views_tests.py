@@ -0,0 +1,59 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import time
+
+from karbor_dashboard.api import karbor
+from karbor_dashboard.scheduledoperations import views
+from karborclient.v1 import scheduled_operations
+from openstack_dashboard.test import helpers as test
+
+Named = collections.namedtuple('Named', ('name',))
+
+
+class SetNamesTests(test.TestCase):
+    def get(self, obj_id):
+        # Resolve the lookups in the reverse order of their ids, so that
+        # results complete out of order.
+        time.sleep(0.01 * (5 - int(obj_id[-1])))
+        if obj_id == "trigger_2":
+            raise Exception("trigger lookup failed")
+        return Named("%s name" % obj_id)
+
+    def test_set_names(self):
+        for kind in ('plan', 'provider', 'trigger'):
+            self.mox.stubs.Set(karbor, '%s_get' % kind,
+                               lambda request, obj_id: self.get(obj_id))
+        operations = [
+            scheduled_operations.ScheduledOperation(None, {
+                "id": "operation_%d" % i,
+                "trigger_id": "trigger_%d" % i,
+                "operation_definition": {"plan_id": "plan_%d" % i,
+                                         "provider_id": "provider_%d" % i},
+            }, loaded=True)
+            for i in range(1, 4)]
+        view = views.IndexView()
+        view.request = self.request
+
+        view.set_names(operations)
+
+        for i, operation in enumerate(operations, 1):
+            self.assertEqual("plan_%d name" % i, operation.plan_name)
+            self.assertEqual("provider_%d name" % i, operation.provider_name)
+            if i == 2:
+                self.assertEqual("", operation.trigger_name)
+            else:
+                self.assertEqual("trigger_%d name" % i,
+                                 operation.trigger_name)
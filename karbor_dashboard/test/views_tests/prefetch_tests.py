@@ -0,0 +1,93 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.test.utils import override_settings
+
+from karbor_dashboard.api import utils as api_utils
+from karbor_dashboard import views as karbor_views
+from karborclient.v1 import plans
+from openstack_dashboard.test import helpers as test
+
+
+class FakeTable(object):
+    pass
+
+
+class FakeView(karbor_views.PrefetchPagesMixin):
+    table_class = FakeTable
+    enriched_attrs = ('provider_name',)
+    loaded = []
+
+    def __init__(self, request, params=None):
+        self.request = request
+        self.params = params
+
+    def get_prefetch_params(self):
+        return self.params
+
+    @classmethod
+    def load_page(cls, request, params, marker, reversed_order):
+        cls.loaded.append((marker, params))
+        start = 0 if marker is None else 2
+        rows = []
+        for i in range(start, start + 2):
+            row = plans.Plan(None, {"id": "plan_%d" % i}, loaded=True)
+            row.provider_name = "provider_%d" % i
+            rows.append(row)
+        return rows, marker is None, marker is not None
+
+
+@override_settings(KARBOR_TABLE_PREFETCH=True)
+class PrefetchPagesTests(test.TestCase):
+    def setUp(self):
+        super(PrefetchPagesTests, self).setUp()
+        api_utils.get_cache().clear()
+        FakeView.loaded = []
+        self.mox.stubs.Set(api_utils, 'submit_background',
+                           lambda func, *args: func(*args))
+
+    def test_get_page_prefetches_next_page(self):
+        view = FakeView(self.request)
+
+        rows, has_more_data, has_prev_data = view.get_page(None, False)
+        self.assertEqual(["plan_0", "plan_1"], [row.id for row in rows])
+        self.assertEqual([None, "plan_1"],
+                         [marker for marker, params in view.loaded])
+
+        # The next page comes from the prefetch, enrichment included.
+        rows, has_more_data, has_prev_data = view.get_page("plan_1", False)
+        self.assertEqual(["plan_2", "plan_3"], [row.id for row in rows])
+        self.assertEqual("provider_3", rows[1].provider_name)
+        self.assertTrue(has_prev_data)
+        self.assertEqual([None, "plan_1"],
+                         [marker for marker, params in view.loaded])
+
+        # A prefetched page is only served once.
+        view.get_page("plan_1", False)
+        self.assertEqual([None, "plan_1", "plan_1"],
+                         [marker for marker, params in view.loaded])
+
+    def test_get_page_prefetches_with_params_of_request(self):
+        calls = []
+        self.mox.stubs.Set(api_utils, 'submit_background',
+                           lambda func, *args: calls.append((func, args)))
+        view = FakeView(self.request, params={"name": "plan"})
+        view.get_page(None, False)
+
+        # The prefetch runs after the response, without asking the view.
+        view.params = {"name": "other"}
+        for func, args in calls:
+            func(*args)
+        self.assertEqual([(None, {"name": "plan"}),
+                          ("plan_1", {"name": "plan"})], view.loaded)
@@ -0,0 +1,86 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from django import http
+from django.test import client
+from django.test.utils import override_settings
+
+from karbor_dashboard.api import watchers
+from karbor_dashboard.restores import tables
+from karbor_dashboard import views as karbor_views
+from openstack_dashboard.test import helpers as test
+
+
+class FakeStatusesView(karbor_views.StatusesView):
+    status_choices = tables.STATUS_CHOICES
+
+    def get_statuses(self, request, ids):
+        statuses = {"restore_1": "in_progress", "restore_2": "success",
+                    "restore_3": None}
+        return dict((obj_id, statuses[obj_id]) for obj_id in ids
+                    if obj_id in statuses)
+
+
+class StatusesViewTests(test.TestCase):
+    def test_get_statuses(self):
+        request = client.RequestFactory().get(
+            '/', {'id': ['restore_1', 'restore_2', 'restore_3', 'restore_4']})
+        response = FakeStatusesView.as_view()(request)
+
+        self.assertEqual(200, response.status_code)
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEqual({"restore_1": ["in_progress", "status_unknown"],
+                          "restore_2": ["success", "status_up"]},
+                         data["statuses"])
+        self.assertEqual(["restore_3"], data["deleted"])
+
+
+class FakeStatusStreamView(karbor_views.StatusStreamView, FakeStatusesView):
+    kind = 'restores'
+    keepalive = 0.05
+
+
+class StatusStreamViewTests(test.TestCase):
+    def setUp(self):
+        super(StatusStreamViewTests, self).setUp()
+        self.mox.stubs.Set(karbor_views, 'STATUS_WATCHERS',
+                           watchers.WatcherRegistry(interval=0.01))
+
+    def test_stream_disabled(self):
+        request = client.RequestFactory().get('/', {'id': ['restore_1']})
+        request.user = self.user
+        self.assertRaises(http.Http404, FakeStatusStreamView.as_view(),
+                          request)
+
+    @override_settings(KARBOR_STATUS_STREAM=True,
+                       KARBOR_STATUS_STREAM_TIMEOUT=5)
+    def test_stream_statuses(self):
+        request = client.RequestFactory().get(
+            '/', {'id': ['restore_1', 'restore_3']})
+        request.user = self.user
+        response = FakeStatusStreamView.as_view()(request)
+        self.assertEqual('text/event-stream', response['Content-Type'])
+
+        content = iter(response.streaming_content)
+        self.assertTrue(next(content).startswith(b'retry: '))
+        chunk = next(content)
+        while chunk.startswith(b':'):
+            chunk = next(content)
+        data = json.loads(chunk.decode('utf-8')[len('data: '):])
+        self.assertEqual({"restore_1": ["in_progress", "status_unknown"]},
+                         data["statuses"])
+        self.assertEqual(["restore_3"], data["deleted"])
+        response.close()
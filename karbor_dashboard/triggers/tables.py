@@ -18,6 +18,7 @@ from django.utils.translation import ungettext_lazy
 from horizon import tables
 
 from karbor_dashboard.api import karbor as karborclient
+from karbor_dashboard import tables as karbor_tables
 
 
 class CreateTriggerLink(tables.LinkAction):
@@ -31,7 +32,8 @@ class CreateTriggerLink(tables.LinkAction):
         return True
 
 
-class DeleteTriggersAction(tables.DeleteAction):
+class DeleteTriggersAction(karbor_tables.ConcurrentDeleteMixin,
+                           tables.DeleteAction):
     @staticmethod
     def action_present(count):
         return ungettext_lazy(u"Delete Trigger",
@@ -52,11 +54,8 @@ class DeleteTriggersAction(tables.DeleteAction):
 
 
 class TriggerFilterAction(tables.FilterAction):
-    def filter(self, table, triggers, filter_string):
-        """Naive case-insensitive search."""
-        query = filter_string.lower()
-        return [trigger for trigger in triggers
-                if query in trigger.name.lower()]
+    filter_type = "server"
+    filter_choices = (('name', _("Name ="), True),)
 
 
 class TriggersTable(tables.DataTable):
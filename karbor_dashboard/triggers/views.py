@@ -26,6 +26,7 @@ from karbor_dashboard.api import karbor as karborclient
 from karbor_dashboard.triggers import forms
 from karbor_dashboard.triggers import tables
 from karbor_dashboard.triggers import utils
+from karbor_dashboard import views as karbor_views
 
 
 class IndexView(horizon_tables.DataTableView):
@@ -54,6 +55,7 @@ class IndexView(horizon_tables.DataTableView):
         try:
             triggers, self._more, self._prev = karborclient.trigger_list_paged(
                 request, None,
+                search_opts=karbor_views.get_search_opts(self.table),
                 marker=marker,
                 paginate=True,
                 sort_dir='asc',
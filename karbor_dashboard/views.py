@@ -12,8 +12,236 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django import http
+from django.utils.encoding import force_text
+from django.utils.translation import ugettext_lazy as _
+from django.views import generic
 import horizon
 
+from karbor_dashboard.api import utils as api_utils
+from karbor_dashboard.api import watchers
+from karbor_dashboard import tables as karbor_tables
+
+LOG = logging.getLogger(__name__)
+
+# Most rows whose status a single poll asks for.
+MAX_STATUS_IDS = 100
+
+# Seconds after which a status stream is closed.
+DEFAULT_STATUS_STREAM_TIMEOUT = 300
+
+# Status watchers shared by the status streams of this process.
+STATUS_WATCHERS = watchers.WatcherRegistry()
+
 
 def get_user_home(user):
     return horizon.get_dashboard('karbor').get_absolute_url()
+
+
+def get_search_opts(table):
+    """Return the search options of the server side filter of a table."""
+    filter_field = table.get_filter_field()
+    filter_string = table.get_filter_string()
+    if filter_field and filter_string:
+        return {filter_field: filter_string}
+    return None
+
+
+def table_prefetch_enabled():
+    return getattr(settings, 'KARBOR_TABLE_PREFETCH', False)
+
+
+class PrefetchPagesMixin(object):
+    """Fetch the next page of a paginated table in the background.
+
+    Opt-in through KARBOR_TABLE_PREFETCH, which takes over from the API
+    level KARBOR_PAGE_PREFETCH: the latter is ignored once the former is
+    set, so that a page is not fetched twice. Views define a
+    ``load_page(request, params, marker, reversed_order)`` class method,
+    which returns the rows of a page, already enriched, along with
+    whether there are more and previous pages, and list the attributes
+    the enrichment sets in ``enriched_attrs``. The next page is loaded
+    after the response was sent, so load_page() may only use its
+    arguments, never the view or its table. Once a page is served the
+    page the user is most likely to ask for next is loaded and kept in a
+    per-user cache for KARBOR_TABLE_PREFETCH_TTL seconds. A prefetched
+    page is served once, later requests load it again.
+    """
+    enriched_attrs = ()
+
+    def get_prefetch_params(self):
+        """Return what, besides the marker, selects the rows of a page.
+
+        The params are taken once the request is received and passed to
+        load_page(), they must be plain values.
+        """
+        return None
+
+    def _prefetch_key(self, params, marker, reversed_order):
+        serialized = json.dumps([self.table_class.__name__, params, marker,
+                                 reversed_order], sort_keys=True, default=str)
+        return ':'.join(('karbor', 'prefetch', self.request.user.tenant_id,
+                         self.request.user.id,
+                         hashlib.sha1(serialized.encode('utf-8')).hexdigest()))
+
+    @classmethod
+    def _dump_page(cls, page):
+        rows, has_more_data, has_prev_data = page
+        rows = [(api_utils.dump_resource(row),
+                 dict((attr, getattr(row, attr, None))
+                      for attr in cls.enriched_attrs))
+                for row in rows]
+        return rows, has_more_data, has_prev_data
+
+    def _load_page(self, value):
+        rows, has_more_data, has_prev_data = value
+        result = []
+        for dumped, attrs in rows:
+            row = api_utils.load_resource(dumped)
+            for attr, attr_value in attrs.items():
+                setattr(row, attr, attr_value)
+            result.append(row)
+        return result, has_more_data, has_prev_data
+
+    @classmethod
+    def _prefetch(cls, request, key, params, marker, reversed_order, ttl):
+        page = cls.load_page(request, params, marker, reversed_order)
+        api_utils.get_cache().set(key, cls._dump_page(page), ttl)
+
+    def get_page(self, marker, reversed_order):
+        params = self.get_prefetch_params()
+        if not table_prefetch_enabled():
+            return self.load_page(self.request, params, marker,
+                                  reversed_order)
+
+        cache = api_utils.get_cache()
+        key = self._prefetch_key(params, marker, reversed_order)
+        cached = cache.get(key)
+        if cached is not None:
+            cache.delete(key)
+            page = self._load_page(cached)
+        else:
+            page = self.load_page(self.request, params, marker,
+                                  reversed_order)
+
+        rows, has_more_data, has_prev_data = page
+        if rows and not reversed_order and has_more_data:
+            next_marker = rows[-1].id
+        elif rows and reversed_order and has_prev_data:
+            next_marker = rows[0].id
+        else:
+            return page
+        api_utils.submit_background(
+            self._prefetch, self.request,
+            self._prefetch_key(params, next_marker, reversed_order),
+            params, next_marker, reversed_order,
+            getattr(settings, 'KARBOR_TABLE_PREFETCH_TTL', 30))
+        return page
+
+
+def status_stream_enabled():
+    return getattr(settings, 'KARBOR_STATUS_STREAM', False)
+
+
+def get_statuses_payload(status_choices, statuses):
+    """Return the response of a statuses view for the given statuses."""
+    return {
+        "statuses": dict(
+            (obj_id, [status, karbor_tables.get_status_class(status_choices,
+                                                             status)])
+            for obj_id, status in statuses.items()
+            if status is not None),
+        "deleted": [obj_id for obj_id, status in statuses.items()
+                    if status is None],
+    }
+
+
+class StatusesView(generic.View):
+    """Return the statuses of the rows of a table in a single response.
+
+    The ids are passed as repeated ``id`` query parameters. The response
+    maps every id to a ``[status, status class]`` pair, the class being
+    the one the status column of the table gives to that status. Objects
+    that no longer exist are listed in ``deleted``. Views set
+    ``status_choices`` and define ``get_statuses(request, ids, **kwargs)``,
+    which is given the arguments of the URL and returns a dict mapping
+    ids to statuses, None for the objects that no longer exist.
+    """
+    status_choices = ()
+
+    def get(self, request, **kwargs):
+        ids = request.GET.getlist('id')[:MAX_STATUS_IDS]
+        try:
+            statuses = self.get_statuses(request, ids, **kwargs)
+        except Exception:
+            LOG.exception('Unable to retrieve statuses.')
+            return http.JsonResponse(
+                {"error": force_text(_('Unable to retrieve statuses.'))},
+                status=500)
+
+        return http.JsonResponse(
+            get_statuses_payload(self.status_choices, statuses))
+
+
+class StatusStreamView(StatusesView):
+    """Stream the status changes of the rows of a table as server events.
+
+    Opt-in through KARBOR_STATUS_STREAM, since every open stream holds a
+    server thread. Streams watching the objects of the same project, kind
+    and provider share one watcher, which polls Karbor every
+    KARBOR_STATUS_STREAM_INTERVAL seconds. Every event carries the same
+    payload as StatusesView. A stream is closed after
+    KARBOR_STATUS_STREAM_TIMEOUT seconds, browsers then reconnect.
+    """
+    kind = None
+    # Seconds after which a comment is sent to keep idle streams open.
+    keepalive = 15
+    # Seconds browsers wait before reopening a closed stream.
+    reconnect_delay = 2
+
+    def get_watcher_key(self, request, **kwargs):
+        return (request.user.tenant_id, self.kind, kwargs.get('provider_id'))
+
+    def get(self, request, **kwargs):
+        if not status_stream_enabled():
+            raise http.Http404()
+
+        response = http.StreamingHttpResponse(
+            self.stream(request, request.GET.getlist('id')[:MAX_STATUS_IDS],
+                        **kwargs),
+            content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def stream(self, request, ids, **kwargs):
+        deadline = time.time() + getattr(
+            settings, 'KARBOR_STATUS_STREAM_TIMEOUT',
+            DEFAULT_STATUS_STREAM_TIMEOUT)
+        # Subscribe once streaming starts, so that the subscription is
+        # closed however the stream ends.
+        subscription = STATUS_WATCHERS.subscribe(
+            self.get_watcher_key(request, **kwargs),
+            functools.partial(self.get_statuses, request, **kwargs),
+            ids)
+        try:
+            yield 'retry: %d\n\n' % (self.reconnect_delay * 1000)
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return
+                statuses = subscription.get(min(self.keepalive, remaining))
+                if statuses is None:
+                    yield ': keepalive\n\n'
+                    continue
+                yield 'data: %s\n\n' % json.dumps(
+                    get_statuses_payload(self.status_choices, statuses))
+        finally:
+            subscription.close()
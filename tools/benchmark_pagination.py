@@ -0,0 +1,118 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark the paged listing of Karbor resources.
+
+Pages forward and back through a list of 1000 resources served by a fake
+API with a fixed latency, first without the page cache (what every
+*_list_paged function used to do), then with the page cache and with the
+page cache and next page prefetching.
+
+Usage: tools/with_venv.sh python tools/benchmark_pagination.py
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE",
+                      "karbor_dashboard.test.settings")
+
+import django  # noqa
+from django.test import client  # noqa
+from django.test.utils import override_settings  # noqa
+
+django.setup()
+
+from karbor_dashboard.api import karbor  # noqa
+from karbor_dashboard.api import utils as api_utils  # noqa
+
+RESOURCE_COUNT = 1000
+PAGE_SIZE = 20
+PAGES = 10
+ROUNDS = 3
+LATENCY = 0.02
+
+
+class FakeResource(object):
+    def __init__(self, index):
+        self.id = "resource_%04d" % index
+        self.name = "Resource %04d" % index
+
+
+class FakeAPI(object):
+    def __init__(self, count):
+        self.resources = [FakeResource(i) for i in range(count)]
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def list(self, marker=None, limit=None, sort_key=None, sort_dir=None,
+             **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(LATENCY)
+        resources = self.resources
+        if sort_dir == 'desc':
+            resources = list(reversed(resources))
+        start = 0
+        if marker is not None:
+            ids = [resource.id for resource in resources]
+            start = ids.index(marker) + 1
+        return resources[start:start + limit]
+
+
+class FakeUser(object):
+    tenant_id = "benchmark"
+
+
+def browse(request, api):
+    """Page forward PAGES times and back again, ROUNDS times."""
+    for i in range(ROUNDS):
+        marker = None
+        page = []
+        for j in range(PAGES):
+            page, more, prev = karbor._list_paged(
+                request, 'benchmark', api.list, marker=marker,
+                sort_key='name', sort_dir='asc', paginate=True)
+            marker = page[-1].id
+        for j in range(PAGES - 1):
+            page, more, prev = karbor._list_paged(
+                request, 'benchmark', api.list, marker=page[0].id,
+                sort_key='name', sort_dir='asc', paginate=True,
+                reversed_order=True)
+
+
+def main():
+    request = client.RequestFactory().get('/')
+    request.session = {}
+    request.user = FakeUser()
+    for name, overrides in (
+            ("no page cache", {}),
+            ("page cache", {'KARBOR_PAGE_CACHE_TTL': 60}),
+            ("page cache and prefetch", {'KARBOR_PAGE_CACHE_TTL': 60,
+                                         'KARBOR_PAGE_PREFETCH': True})):
+        api_utils.get_cache().clear()
+        api = FakeAPI(RESOURCE_COUNT)
+        with override_settings(API_RESULT_PAGE_SIZE=PAGE_SIZE, **overrides):
+            start = time.time()
+            browse(request, api)
+            elapsed = time.time() - start
+        print("%s: %d API calls in %.3fs" % (name, api.calls, elapsed))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
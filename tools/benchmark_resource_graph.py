@@ -0,0 +1,98 @@
+#    Copyright (c) 2016 Huawei, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark the loading and paging of checkpoint resource graphs.
+
+Builds a synthetic resource graph of 50k nodes (projects owning servers,
+each server with volumes and an image) and times the ResourceTree built
+for the checkpoint detail and restore views, then times walking the whole
+tree a page at a time as the resource views do.
+
+Usage: tools/with_venv.sh python tools/benchmark_resource_graph.py
+"""
+
+from __future__ import print_function
+
+import json
+import os
+import sys
+import timeit
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE",
+                      "karbor_dashboard.test.settings")
+
+from karbor_dashboard.checkpoints import utils  # noqa
+
+NODE_COUNT = 50000
+VOLUMES_PER_SERVER = 3
+
+
+def build_graph(node_count):
+    nodes = {}
+    adjacency = []
+    sid = [0]
+
+    def add_node(node_type, name):
+        node_sid = str(sid[0])
+        sid[0] += 1
+        nodes[node_sid] = [node_type, "%s_id" % name, name]
+        return node_sid
+
+    while len(nodes) < node_count:
+        project = add_node("OS::Keystone::Project", "project_%d" % sid[0])
+        servers = []
+        for i in range(100):
+            server = add_node("OS::Nova::Server", "server_%d" % sid[0])
+            children = [add_node("OS::Cinder::Volume", "volume_%d" % sid[0])
+                        for j in range(VOLUMES_PER_SERVER)]
+            children.append(add_node("OS::Glance::Image",
+                                     "image_%d" % sid[0]))
+            adjacency.append([server, children])
+            servers.append(server)
+        adjacency.append([project, servers])
+    return json.dumps([nodes, adjacency])
+
+
+def walk_tree(tree):
+    """Return the number of rows of every page of the tree."""
+    count = 0
+    parents = [None]
+    while parents:
+        parent_sid = parents.pop()
+        marker = None
+        while True:
+            rows, marker = utils.get_tree_page(tree, parent_sid=parent_sid,
+                                               marker=marker)
+            count += len(rows)
+            parents.extend(row.showid for row in rows if row.has_children)
+            if marker is None:
+                break
+    return count
+
+
+def main():
+    graph = build_graph(NODE_COUNT)
+    runs = 5
+    elapsed = timeit.timeit(lambda: utils.build_resource_tree(graph),
+                            number=runs) / runs
+    tree = utils.build_resource_tree(graph)
+    print("build_resource_tree: %d nodes from %d bytes in %.3fs"
+          % (len(tree.nodes), len(graph), elapsed))
+
+    elapsed = timeit.timeit(lambda: walk_tree(tree), number=runs) / runs
+    print("get_tree_page: %d rows in %.3fs" % (walk_tree(tree), elapsed))
+
+
+if __name__ == "__main__":
+    sys.exit(main())